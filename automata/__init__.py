@@ -2,18 +2,31 @@
 Automata Module for defining, manipulating, and simulating finite automata.
 """
 
-from .models import State, Alphabet, Transition, Automaton
+from .models import State, Alphabet, Transition, Automaton, EPSILON
 from .operations import (
     is_deterministic, is_complete, nfa_to_dfa, minimize_automaton,
-    union, intersection, complement, are_equivalent
+    union, intersection, complement, are_equivalent, product,
+    equivalence_counterexample, is_subset, inclusion_counterexample, trim,
+    minimize_brzozowski
 )
-from .simulation import simulate, generate_accepted_words, generate_rejected_words
+from .simulation import simulate, simulate_many, simulate_file, Runner, generate_accepted_words, generate_rejected_words
 from .storage import save_automaton, load_automaton
+from .compact import CompactAutomaton
+from .compiled import CompiledDFA, BitsetNFA, LazyDFA
+from .regex import compile_regex
+from .scanner import Scanner
+from .parallel import parallel_simulate
+from .language import count_words, count_words_upto, is_finite, is_infinite, sample_words, iter_words, rank, unrank
 
 __all__ = [
-    'State', 'Alphabet', 'Transition', 'Automaton',
+    'State', 'Alphabet', 'Transition', 'Automaton', 'EPSILON',
     'is_deterministic', 'is_complete', 'nfa_to_dfa', 'minimize_automaton',
-    'union', 'intersection', 'complement', 'are_equivalent',
-    'simulate', 'generate_accepted_words', 'generate_rejected_words',
-    'save_automaton', 'load_automaton'
+    'union', 'intersection', 'complement', 'are_equivalent', 'product',
+    'equivalence_counterexample', 'is_subset', 'inclusion_counterexample', 'trim', 'minimize_brzozowski',
+    'simulate', 'simulate_many', 'simulate_file', 'Runner', 'generate_accepted_words', 'generate_rejected_words',
+    'save_automaton', 'load_automaton',
+    'CompactAutomaton', 'CompiledDFA', 'BitsetNFA', 'LazyDFA',
+    'compile_regex', 'Scanner', 'parallel_simulate',
+    'count_words', 'count_words_upto', 'is_finite', 'is_infinite', 'sample_words',
+    'iter_words', 'rank', 'unrank'
 ] 
\ No newline at end of file
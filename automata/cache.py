@@ -0,0 +1,40 @@
+"""
+Per-automaton memoization of derived forms (determinized DFA, compiled tables).
+
+Entries live in ``automaton._cache`` and are dropped by
+``Automaton.mark_modified()``, which every mutating method calls, writes to
+a member state's ``is_initial``/``is_final`` included. Edits to the
+``states`` dict itself bypass the automaton's indexes and should be avoided;
+``transitions`` is a read-only snapshot.
+"""
+from typing import Any, Callable
+
+from .models import Automaton
+from .operations import is_deterministic, nfa_to_dfa
+from .compiled import CompiledDFA, BitsetNFA, LazyDFA
+
+
+def memoize(automaton: Automaton, key: str, factory: Callable[[Automaton], Any]) -> Any:
+    cache = automaton._cache
+    if key not in cache:
+        cache[key] = factory(automaton)
+    return cache[key]
+
+
+def cached_dfa(automaton: Automaton) -> Automaton:
+    return memoize(
+        automaton, "dfa",
+        lambda a: a if is_deterministic(a) else nfa_to_dfa(a)
+    )
+
+
+def cached_compiled(automaton: Automaton) -> CompiledDFA:
+    return memoize(automaton, "compiled", CompiledDFA.from_automaton)
+
+
+def cached_nfa(automaton: Automaton) -> BitsetNFA:
+    return memoize(automaton, "nfa", BitsetNFA.from_automaton)
+
+
+def cached_lazy_dfa(automaton: Automaton) -> LazyDFA:
+    return memoize(automaton, "lazy_dfa", lambda a: LazyDFA(cached_nfa(a)))
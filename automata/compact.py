@@ -0,0 +1,412 @@
+"""
+Integer-indexed compact representation of finite automata.
+
+States and symbols are interned to dense integers and the transition relation
+is stored CSR-style in flat arrays: for state ``q`` and symbol column ``a`` the
+targets are ``targets[offsets[q * k + a]:offsets[q * k + a + 1]]`` where ``k`` is
+the number of symbols. Epsilon transitions are kept in a separate CSR pair
+(``epsilon_offsets``/``epsilon_targets``, one row per state). ``State`` and
+``Transition`` objects are only materialized on demand (GUI and JSON paths)
+through ``to_automaton``.
+"""
+from array import array
+from typing import Dict, List, Optional, Tuple, Iterator, Callable
+
+from .models import State, Alphabet, Transition, Automaton, EPSILON
+
+# Above this many states the byte-chunk tables used for subset steps get too
+# large and steps iterate over the set bits instead
+CHUNKED_STEP_MAX_STATES = 512
+
+
+class CompactAutomaton:
+    def __init__(
+        self,
+        name: str,
+        state_names: List[str],
+        symbols: List[str],
+        initial: int,
+        finals: bytearray,
+        offsets: array,
+        targets: array,
+        creator_id: Optional[str] = None,
+        epsilon_offsets: Optional[array] = None,
+        epsilon_targets: Optional[array] = None
+    ):
+        self.name = name
+        self.state_names = state_names
+        self.symbols = symbols
+        self.initial = initial
+        self.finals = finals
+        self.offsets = offsets
+        self.targets = targets
+        self.creator_id = creator_id
+        self.epsilon_offsets = epsilon_offsets if epsilon_offsets is not None else array('i', [0]) * (len(state_names) + 1)
+        self.epsilon_targets = epsilon_targets if epsilon_targets is not None else array('i')
+
+        # Epsilon closures as bitmasks, computed on first use
+        self._closures: Optional[List[int]] = None
+
+        self.state_index: Dict[str, int] = {n: i for i, n in enumerate(state_names)}
+        self.symbol_index: Dict[str, int] = {s: i for i, s in enumerate(symbols)}
+
+    @classmethod
+    def from_automaton(cls, automaton: Automaton) -> "CompactAutomaton":
+        state_names = list(automaton.states.keys())
+        state_index = {n: i for i, n in enumerate(state_names)}
+        symbols = [s for s in automaton.alphabet.symbols if s != EPSILON]
+        symbol_index = {s: i for i, s in enumerate(symbols)}
+        n, k = len(state_names), len(symbols)
+
+        # Bucket destinations per (state, symbol) slot; entries whose state or
+        # symbol is no longer part of the automaton are ignored
+        buckets: Dict[int, List[int]] = {}
+        epsilon_buckets: Dict[int, List[int]] = {}
+        for (src, symbol), dests in automaton.delta.items():
+            q = state_index.get(src)
+            if q is None:
+                continue
+            row = sorted(state_index[d] for d in dests if d in state_index)
+            if not row:
+                continue
+            if symbol == EPSILON:
+                epsilon_buckets[q] = row
+            elif symbol in symbol_index:
+                buckets[q * k + symbol_index[symbol]] = row
+
+        offsets = array('i', [0]) * (n * k + 1)
+        targets = array('i')
+        for slot in range(n * k):
+            row = buckets.get(slot)
+            if row:
+                targets.extend(row)
+            offsets[slot + 1] = len(targets)
+
+        epsilon_offsets = array('i', [0]) * (n + 1)
+        epsilon_targets = array('i')
+        for q in range(n):
+            row = epsilon_buckets.get(q)
+            if row:
+                epsilon_targets.extend(row)
+            epsilon_offsets[q + 1] = len(epsilon_targets)
+
+        finals = bytearray(n)
+        for state in automaton.get_finals():
+            finals[state_index[state.name]] = 1
+
+        initial = state_index[automaton.get_initial().name]
+        return cls(automaton.name, state_names, symbols, initial, finals,
+                   offsets, targets, automaton.creator_id,
+                   epsilon_offsets, epsilon_targets)
+
+    @property
+    def num_states(self) -> int:
+        return len(self.state_names)
+
+    @property
+    def num_symbols(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def num_transitions(self) -> int:
+        return len(self.targets) + len(self.epsilon_targets)
+
+    @property
+    def has_epsilon(self) -> bool:
+        return len(self.epsilon_targets) > 0
+
+    @property
+    def initial_mask(self) -> int:
+        return self.epsilon_closures()[self.initial]
+
+    @property
+    def final_mask(self) -> int:
+        mask = 0
+        for i, is_final in enumerate(self.finals):
+            if is_final:
+                mask |= 1 << i
+        return mask
+
+    def successors(self, state: int, symbol: int) -> array:
+        slot = state * len(self.symbols) + symbol
+        return self.targets[self.offsets[slot]:self.offsets[slot + 1]]
+
+    def iter_transitions(self) -> Iterator[Tuple[int, int, int]]:
+        k = len(self.symbols)
+        offsets, targets = self.offsets, self.targets
+        for slot in range(len(offsets) - 1):
+            q, a = divmod(slot, k)
+            for i in range(offsets[slot], offsets[slot + 1]):
+                yield q, a, targets[i]
+
+    def iter_epsilon_transitions(self) -> Iterator[Tuple[int, int]]:
+        offsets, targets = self.epsilon_offsets, self.epsilon_targets
+        for q in range(len(offsets) - 1):
+            for i in range(offsets[q], offsets[q + 1]):
+                yield q, targets[i]
+
+    def epsilon_closures(self) -> List[int]:
+        # closures[q] is the bitmask of states reachable from q through
+        # epsilon transitions (q included). Computed once per strongly
+        # connected component of the epsilon graph: states of one component
+        # share a closure, and Tarjan's algorithm emits components in reverse
+        # topological order, so successor components are always done first
+        if self._closures is not None:
+            return self._closures
+
+        n = len(self.state_names)
+        offsets, targets = self.epsilon_offsets, self.epsilon_targets
+        if not self.has_epsilon:
+            self._closures = [1 << q for q in range(n)]
+            return self._closures
+
+        closures = [0] * n
+        index = [-1] * n
+        lowlink = [0] * n
+        on_stack = bytearray(n)
+        scc_stack: List[int] = []
+        counter = 0
+
+        for root in range(n):
+            if index[root] >= 0:
+                continue
+            # Iterative Tarjan: (state, next edge position) frames
+            work = [(root, offsets[root])]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            scc_stack.append(root)
+            on_stack[root] = 1
+            while work:
+                q, pos = work[-1]
+                if pos < offsets[q + 1]:
+                    work[-1] = (q, pos + 1)
+                    dest = targets[pos]
+                    if index[dest] < 0:
+                        index[dest] = lowlink[dest] = counter
+                        counter += 1
+                        scc_stack.append(dest)
+                        on_stack[dest] = 1
+                        work.append((dest, offsets[dest]))
+                    elif on_stack[dest]:
+                        lowlink[q] = min(lowlink[q], index[dest])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[q])
+                if lowlink[q] != index[q]:
+                    continue
+
+                # q is the root of a component: pop it and close it
+                members = []
+                while True:
+                    member = scc_stack.pop()
+                    on_stack[member] = 0
+                    members.append(member)
+                    if member == q:
+                        break
+                closure = 0
+                for member in members:
+                    closure |= 1 << member
+                for member in members:
+                    for i in range(offsets[member], offsets[member + 1]):
+                        closure |= closures[targets[i]]
+                for member in members:
+                    closures[member] = closure
+
+        self._closures = closures
+        return closures
+
+    def is_deterministic(self) -> bool:
+        if self.has_epsilon:
+            return False
+        offsets = self.offsets
+        return all(offsets[i + 1] - offsets[i] <= 1 for i in range(len(offsets) - 1))
+
+    def reachable(self) -> bytearray:
+        # Forward search from the initial state
+        n, k = len(self.state_names), len(self.symbols)
+        offsets, targets = self.offsets, self.targets
+        seen = bytearray(n)
+        seen[self.initial] = 1
+        stack = [self.initial]
+        epsilon_offsets, epsilon_targets = self.epsilon_offsets, self.epsilon_targets
+        while stack:
+            q = stack.pop()
+            for dest in targets[offsets[q * k]:offsets[q * k + k]] + epsilon_targets[epsilon_offsets[q]:epsilon_offsets[q + 1]]:
+                if not seen[dest]:
+                    seen[dest] = 1
+                    stack.append(dest)
+        return seen
+
+    def coreachable(self) -> bytearray:
+        # Backward search from the final states
+        n = len(self.state_names)
+        preds: List[List[int]] = [[] for _ in range(n)]
+        for q, _, dest in self.iter_transitions():
+            preds[dest].append(q)
+        for q, dest in self.iter_epsilon_transitions():
+            preds[dest].append(q)
+        seen = bytearray(self.finals)
+        stack = [q for q in range(n) if seen[q]]
+        while stack:
+            q = stack.pop()
+            for p in preds[q]:
+                if not seen[p]:
+                    seen[p] = 1
+                    stack.append(p)
+        return seen
+
+    def successor_masks(self) -> List[List[int]]:
+        # masks[a][q] is the bitmask of states reached from q on symbol a,
+        # followed by epsilon closure, so stepping an epsilon-closed set
+        # yields an epsilon-closed set
+        closures = self.epsilon_closures()
+        masks = [[0] * len(self.state_names) for _ in self.symbols]
+        for q, a, dest in self.iter_transitions():
+            masks[a][q] |= closures[dest]
+        return masks
+
+    def determinize(self) -> "CompactAutomaton":
+        return subset_construction(
+            self.successor_masks(), self.initial_mask, self.final_mask,
+            self.symbols, self.name, self.creator_id
+        )
+
+    def reversed_successor_masks(self) -> Tuple[List[List[int]], int]:
+        # Successor masks and initial mask of the reversed automaton: subsets
+        # start from the final states and follow transitions (and epsilon
+        # moves) backwards
+        n = len(self.state_names)
+        backward = [1 << q for q in range(n)]
+        if self.has_epsilon:
+            # backward[q] is the set of states whose epsilon closure holds q
+            for p, closure in enumerate(self.epsilon_closures()):
+                while closure:
+                    low = closure & -closure
+                    backward[low.bit_length() - 1] |= 1 << p
+                    closure ^= low
+
+        masks = [[0] * n for _ in self.symbols]
+        for q, a, dest in self.iter_transitions():
+            masks[a][dest] |= backward[q]
+
+        initial_mask = 0
+        for q in range(n):
+            if self.finals[q]:
+                initial_mask |= backward[q]
+        return masks, initial_mask
+
+    def reverse_determinize(self) -> "CompactAutomaton":
+        # DFA of the reversed language; a subset is final when it holds the
+        # initial state
+        masks, initial_mask = self.reversed_successor_masks()
+        return subset_construction(
+            masks, initial_mask, 1 << self.initial,
+            self.symbols, self.name, self.creator_id
+        )
+
+    def state(self, index: int) -> State:
+        return State(self.state_names[index], index == self.initial, bool(self.finals[index]))
+
+    def to_automaton(self, name: Optional[str] = None) -> Automaton:
+        states = [self.state(i) for i in range(len(self.state_names))]
+        symbols = self.symbols
+        transitions = [
+            Transition(states[q], symbols[a], states[dest])
+            for q, a, dest in self.iter_transitions()
+        ]
+        transitions.extend(
+            Transition(states[q], EPSILON, states[dest])
+            for q, dest in self.iter_epsilon_transitions()
+        )
+        return Automaton(name or self.name, Alphabet(symbols), states, transitions, self.creator_id)
+
+    def __str__(self) -> str:
+        return (f"CompactAutomaton {self.name} with {self.num_states} states "
+                f"and {self.num_transitions} transitions")
+
+
+def step_mask(row: List[int], mask: int) -> int:
+    # Subset step: union of the successor masks of every state in mask
+    result = 0
+    while mask:
+        low = mask & -mask
+        result |= row[low.bit_length() - 1]
+        mask ^= low
+    return result
+
+
+def _byte_tables(row: List[int]) -> List[List[int]]:
+    # tables[c][v] is the union of the successor masks of the states whose
+    # bits are set in byte value v of byte c of a subset mask
+    tables = []
+    for base in range(0, len(row), 8):
+        table = [0] * 256
+        for v in range(1, 256):
+            low = (v & -v).bit_length() - 1
+            q = base + low
+            table[v] = table[v & (v - 1)] | (row[q] if q < len(row) else 0)
+        tables.append(table)
+    return tables
+
+
+def make_step(successors: List[List[int]]) -> Callable[[int, int], int]:
+    # Build step(mask, col) for the subset automaton of the given successor
+    # masks; small automata use byte-chunk lookup tables
+    n = len(successors[0]) if successors else 0
+    if n > CHUNKED_STEP_MAX_STATES:
+        return lambda mask, col: step_mask(successors[col], mask)
+
+    tables = [_byte_tables(row) for row in successors]
+    num_bytes = (n + 7) // 8
+
+    def step(mask: int, col: int) -> int:
+        result = 0
+        for table, byte in zip(tables[col], mask.to_bytes(num_bytes, "little")):
+            if byte:
+                result |= table[byte]
+        return result
+
+    return step
+
+
+def subset_construction(
+    successors: List[List[int]],
+    initial_mask: int,
+    final_mask: int,
+    symbols: List[str],
+    name: str = "",
+    creator_id: Optional[str] = None
+) -> CompactAutomaton:
+    # Reachable-only subset construction over int bitmasks. Subsets are
+    # numbered q0, q1, ... in breadth-first order, finality is a single mask
+    # test and the DFA is written straight into CSR arrays
+    step = make_step(successors)
+    k = len(symbols)
+
+    ids: Dict[int, int] = {initial_mask: 0}
+    masks = [initial_mask]
+    finals = bytearray()
+    offsets = array('i', [0])
+    targets = array('i')
+
+    index = 0
+    while index < len(masks):
+        mask = masks[index]
+        finals.append(1 if mask & final_mask else 0)
+        for col in range(k):
+            next_mask = step(mask, col)
+            if next_mask:
+                dest = ids.get(next_mask)
+                if dest is None:
+                    dest = len(masks)
+                    ids[next_mask] = dest
+                    masks.append(next_mask)
+                targets.append(dest)
+            offsets.append(len(targets))
+        index += 1
+
+    state_names = [f"q{i}" for i in range(len(masks))]
+    return CompactAutomaton(name, state_names, list(symbols), 0, finals, offsets, targets, creator_id)
@@ -0,0 +1,349 @@
+"""
+Compiled execution engines for fast word acceptance.
+"""
+from array import array
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, List, Union, Iterable, Optional, Any
+
+import numpy as np
+
+from .models import Automaton
+from .compact import CompactAutomaton, make_step
+
+# Column value used for missing transitions and unknown bytes
+DEAD = -1
+# Number of words encoded into one matrix by accepts_many()
+BATCH_SIZE = 4096
+# Default number of subset states kept by LazyDFA
+LAZY_DFA_MAX_STATES = 10000
+
+
+class CompiledDFA:
+    """
+    Dense ``state x symbol -> state`` table built once from an automaton.
+
+    Missing transitions are stored as ``DEAD``. Symbols are mapped to table
+    columns through ``columns`` (characters) and ``byte_columns`` (a 256-entry
+    list used when the input is ``bytes``).
+    """
+
+    def __init__(self, compact: CompactAutomaton):
+        if not compact.is_deterministic():
+            raise ValueError("CompiledDFA requires a deterministic automaton")
+
+        n, k = compact.num_states, compact.num_symbols
+        offsets, targets = compact.offsets, compact.targets
+
+        table = array('i', [DEAD]) * (n * k)
+        for slot in range(n * k):
+            if offsets[slot] != offsets[slot + 1]:
+                table[slot] = targets[offsets[slot]]
+
+        self.name = compact.name
+        self.symbols = compact.symbols
+        self.state_names = compact.state_names
+        self.num_states = n
+        self.num_symbols = k
+        self.initial = compact.initial
+        self.finals = bytes(compact.finals)
+        self.table = table
+
+        self.columns: Dict[str, int] = dict(compact.symbol_index)
+        self.byte_columns: List[int] = [DEAD] * 256
+        for symbol, col in self.columns.items():
+            if len(symbol) == 1 and ord(symbol) < 256:
+                self.byte_columns[ord(symbol)] = col
+
+        # NumPy form of the table, built on first use by accepts_many()
+        self._batch_table: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_automaton(cls, automaton: Automaton) -> "CompiledDFA":
+        # Determinize at the integer level, no intermediate Automaton
+        compact = CompactAutomaton.from_automaton(automaton)
+        if not compact.is_deterministic():
+            compact = compact.determinize()
+        return cls(compact)
+
+    @property
+    def initial_state(self) -> int:
+        return self.initial
+
+    def run(self, state: int, word: Union[str, bytes]) -> int:
+        # Advance from state over word; DEAD is absorbing, so symbols read
+        # after the run died are not checked against the alphabet
+        if state < 0:
+            return state
+        table, k = self.table, self.num_symbols
+
+        if isinstance(word, (bytes, bytearray)):
+            byte_columns = self.byte_columns
+            for byte in word:
+                col = byte_columns[byte]
+                if col < 0:
+                    raise ValueError(f"Symbol {chr(byte)} not in alphabet")
+                state = table[state * k + col]
+                if state < 0:
+                    return DEAD  # No transition, reject
+        else:
+            columns = self.columns
+            for symbol in word:
+                col = columns.get(symbol)
+                if col is None:
+                    raise ValueError(f"Symbol {symbol} not in alphabet")
+                state = table[state * k + col]
+                if state < 0:
+                    return DEAD  # No transition, reject
+
+        return state
+
+    def is_accepting_state(self, state: int) -> bool:
+        return state >= 0 and bool(self.finals[state])
+
+    def is_dead_state(self, state: int) -> bool:
+        return state < 0
+
+    def accepts(self, word: Union[str, bytes]) -> bool:
+        return self.is_accepting_state(self.run(self.initial, word))
+
+    def _build_batch_table(self) -> np.ndarray:
+        # Extended table: row n is the dead state and row n + 1 an error state
+        # reached on an unknown symbol; column k is padding (stay in place) and
+        # column k + 1 stands for every symbol outside the alphabet
+        n, k = self.num_states, self.num_symbols
+        dead, error = n, n + 1
+        table = np.empty((n + 2, k + 2), dtype=np.int32)
+        table[:n, :k] = np.frombuffer(self.table, dtype=np.int32).reshape(n, k)
+        table[:n, :k][table[:n, :k] < 0] = dead
+        table[:, k] = np.arange(n + 2, dtype=np.int32)
+        table[:n, k + 1] = error
+        table[dead, :] = dead
+        table[error, :] = error
+        return table
+
+    def _encode_batch(self, batch: List[Union[str, bytes]]) -> np.ndarray:
+        k = self.num_symbols
+        pad, unknown = k, k + 1
+
+        if isinstance(batch[0], (bytes, bytearray)):
+            codes = np.frombuffer(b"".join(batch), dtype=np.uint8)
+            lut = np.array(self.byte_columns, dtype=np.int32)
+        else:
+            codes = np.frombuffer("".join(batch).encode("utf-32-le"), dtype=np.uint32)
+            single = [s for s in self.columns if len(s) == 1]
+            # Last entry catches every code point above the alphabet
+            lut = np.full(max((ord(s) for s in single), default=0) + 2, DEAD, dtype=np.int32)
+            for symbol in single:
+                lut[ord(symbol)] = self.columns[symbol]
+            codes = np.minimum(codes, len(lut) - 1)
+        lut[lut < 0] = unknown
+
+        cols = lut[codes]
+        lengths = np.fromiter((len(w) for w in batch), dtype=np.int64, count=len(batch))
+
+        # One row per symbol position so each step reads a contiguous row
+        matrix = np.full((len(batch), int(lengths.max(initial=0))), pad, dtype=np.int32)
+        matrix[np.arange(matrix.shape[1]) < lengths[:, None]] = cols
+        return np.ascontiguousarray(matrix.T)
+
+    def accepts_many(self, words: Iterable[Union[str, bytes]], batch_size: int = BATCH_SIZE) -> np.ndarray:
+        if self._batch_table is None:
+            self._batch_table = self._build_batch_table()
+        table = self._batch_table
+        n = self.num_states
+        accepting = np.zeros(n + 2, dtype=bool)
+        accepting[:n] = np.frombuffer(self.finals, dtype=np.uint8).astype(bool)
+
+        results = []
+        iterator = iter(words)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+
+            # Advance every word of the batch one symbol per column
+            state = np.full(len(batch), self.initial, dtype=np.int32)
+            for col in self._encode_batch(batch):
+                state = table[state, col]
+
+            errors = np.flatnonzero(state == n + 1)
+            if errors.size:
+                word = batch[errors[0]]
+                if isinstance(word, (bytes, bytearray)):
+                    word = word.decode("latin-1")
+                symbol = next(s for s in word if s not in self.columns)
+                raise ValueError(f"Symbol {symbol} not in alphabet")
+
+            results.append(accepting[state])
+
+        if not results:
+            return np.zeros(0, dtype=bool)
+        return np.concatenate(results)
+
+    def __str__(self) -> str:
+        return f"CompiledDFA {self.name} with {self.num_states} states and {self.num_symbols} symbols"
+
+
+class BitsetNFA:
+    """
+    Direct NFA simulation over state sets encoded as Python int bitmasks.
+
+    ``successors[a][q]`` is the mask of states reachable from ``q`` on symbol
+    column ``a``, so a step only ORs the masks of the active states and
+    finality is a single AND with ``final_mask``. No DFA is ever built.
+    """
+
+    def __init__(self, compact: CompactAutomaton):
+        self.name = compact.name
+        self.symbols = compact.symbols
+        self.state_names = compact.state_names
+        self.num_states = compact.num_states
+        self.num_symbols = compact.num_symbols
+        self.initial_mask = compact.initial_mask
+        self.final_mask = compact.final_mask
+        self.successors = compact.successor_masks()
+        self.columns: Dict[str, int] = dict(compact.symbol_index)
+        self._step = make_step(self.successors)
+
+    @classmethod
+    def from_automaton(cls, automaton: Automaton) -> "BitsetNFA":
+        return cls(CompactAutomaton.from_automaton(automaton))
+
+    def step(self, mask: int, col: int) -> int:
+        return self._step(mask, col)
+
+    @property
+    def initial_state(self) -> int:
+        return self.initial_mask
+
+    def run(self, mask: int, word: Union[str, bytes]) -> int:
+        # The empty mask is absorbing, like DEAD for CompiledDFA
+        if not mask:
+            return mask
+        if isinstance(word, (bytes, bytearray)):
+            word = word.decode("latin-1")
+
+        columns, step = self.columns, self.step
+        for symbol in word:
+            col = columns.get(symbol)
+            if col is None:
+                raise ValueError(f"Symbol {symbol} not in alphabet")
+            mask = step(mask, col)
+            if not mask:
+                return 0  # No transition, reject
+
+        return mask
+
+    def is_accepting_state(self, mask: int) -> bool:
+        return bool(mask & self.final_mask)
+
+    def is_dead_state(self, mask: int) -> bool:
+        return not mask
+
+    def accepts(self, word: Union[str, bytes]) -> bool:
+        return self.is_accepting_state(self.run(self.initial_mask, word))
+
+    def __str__(self) -> str:
+        return f"BitsetNFA {self.name} with {self.num_states} states and {self.num_symbols} symbols"
+
+
+class LazyDFA:
+    """
+    On-the-fly determinization of an NFA (in the spirit of RE2).
+
+    Subset states are created only when a word reaches them, using the same
+    bitmask step as ``BitsetNFA``. Each cached subset keeps a row of already
+    computed successors; the cache holds at most ``max_states`` subsets and
+    evicts the least recently used one. A transition missing from the cache
+    is computed by plain bitset stepping.
+    """
+
+    def __init__(self, nfa: BitsetNFA, max_states: int = LAZY_DFA_MAX_STATES):
+        if max_states < 1:
+            raise ValueError("max_states must be at least 1")
+
+        self.nfa = nfa
+        self.max_states = max_states
+        self.columns = nfa.columns
+        self._states: "OrderedDict[int, List[Optional[int]]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_automaton(cls, automaton: Automaton, max_states: int = LAZY_DFA_MAX_STATES) -> "LazyDFA":
+        return cls(BitsetNFA.from_automaton(automaton), max_states)
+
+    def _row(self, mask: int) -> List[Optional[int]]:
+        states = self._states
+        row = states.get(mask)
+        if row is None:
+            row = [None] * self.nfa.num_symbols
+            states[mask] = row
+            if len(states) > self.max_states:
+                states.popitem(last=False)
+                self.evictions += 1
+        else:
+            states.move_to_end(mask)
+        return row
+
+    def step(self, mask: int, col: int) -> int:
+        row = self._row(mask)
+        next_mask = row[col]
+        if next_mask is None:
+            self.misses += 1
+            next_mask = self.nfa.step(mask, col)
+            row[col] = next_mask
+        else:
+            self.hits += 1
+        return next_mask
+
+    @property
+    def initial_state(self) -> int:
+        return self.nfa.initial_mask
+
+    def run(self, mask: int, word: Union[str, bytes]) -> int:
+        if not mask:
+            return mask
+        if isinstance(word, (bytes, bytearray)):
+            word = word.decode("latin-1")
+
+        columns, step = self.columns, self.step
+        for symbol in word:
+            col = columns.get(symbol)
+            if col is None:
+                raise ValueError(f"Symbol {symbol} not in alphabet")
+            mask = step(mask, col)
+            if not mask:
+                return 0  # No transition, reject
+
+        return mask
+
+    def is_accepting_state(self, mask: int) -> bool:
+        return bool(mask & self.nfa.final_mask)
+
+    def is_dead_state(self, mask: int) -> bool:
+        return not mask
+
+    def accepts(self, word: Union[str, bytes]) -> bool:
+        return self.is_accepting_state(self.run(self.nfa.initial_mask, word))
+
+    def clear(self) -> None:
+        self._states.clear()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "states": len(self._states),
+            "max_states": self.max_states,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __str__(self) -> str:
+        return f"LazyDFA {self.nfa.name} with {len(self._states)} cached subset states"
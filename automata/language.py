@@ -0,0 +1,334 @@
+"""
+Quantitative questions about the language of an automaton.
+
+Counts are computed by dynamic programming over the compiled DFA table:
+``counts[i][q]`` is the number of words of length ``i`` that lead state ``q``
+to a final state, so ``counts[i + 1][q]`` is the sum of ``counts[i][p]`` over
+the successors ``p`` of ``q``. Counts are exact Python ints; while they are
+guaranteed to fit in 64 bits the steps run as NumPy gathers over the table.
+
+The same table drives exact uniform sampling: a word of length ``n`` is drawn
+symbol by symbol, each symbol chosen with probability proportional to the
+number of completions from the state it leads to. The complement uses
+``k ** i - counts[i][q]``, a missing transition counting as ``k ** i``. It
+also ranks words in shortlex order (by length, then lexicographically by
+symbol), so enumeration can start at any index without listing the words
+before it.
+"""
+import random
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from .models import Automaton
+from .compiled import CompiledDFA, DEAD
+from .cache import memoize, cached_compiled
+
+# Counts below this bound are computed with int64 NumPy arrays
+_INT64_LIMIT = 1 << 63
+
+
+class PathCounts:
+    """
+    Per-length word counts from every state of a compiled DFA, extended on
+    demand and kept for the automaton version through ``cached_path_counts``.
+    """
+
+    def __init__(self, dfa: CompiledDFA):
+        self.dfa = dfa
+        n, k = dfa.num_states, dfa.num_symbols
+
+        # Missing transitions go to an extra all-zero entry at index n
+        table = np.frombuffer(dfa.table, dtype=np.int32).reshape(n, k).astype(np.intp)
+        table[table < 0] = n
+        self._table = table
+
+        self.counts: List[List[int]] = [[int(f) for f in dfa.finals]]
+
+        # Columns in canonical (sorted symbol) order and the inverse mapping
+        self.order = sorted(range(k), key=lambda col: dfa.symbols[col])
+        self.positions = {col: pos for pos, col in enumerate(self.order)}
+
+    def extend(self, length: int) -> None:
+        counts, table = self.counts, self._table
+        k = self.dfa.num_symbols
+        while len(counts) <= length:
+            current = counts[-1] + [0]
+            if k ** len(counts) < _INT64_LIMIT:
+                # Any count at this length is at most k ** length
+                step = np.array(current, dtype=np.int64)[table].sum(axis=1)
+                counts.append(step.tolist())
+            else:
+                counts.append([sum(current[p] for p in row) for row in table.tolist()])
+
+    def count(self, length: int, state: Optional[int] = None) -> int:
+        if length < 0:
+            return 0
+        self.extend(length)
+        return self.counts[length][self.dfa.initial if state is None else state]
+
+    def total(self, length: int, accepted: bool = True, state: Optional[int] = None) -> int:
+        count = self.count(length, state)
+        return count if accepted else self.dfa.num_symbols ** length - count
+
+    def sample(self, length: int, rng: random.Random, accepted: bool = True) -> Optional[str]:
+        # Uniform over the words of this length in L(A), or in its complement
+        if self.total(length, accepted) == 0:
+            return None
+        dfa, counts = self.dfa, self.counts
+        k, symbols, table = dfa.num_symbols, dfa.symbols, dfa.table
+
+        word = []
+        q = dfa.initial
+        for remaining in range(length - 1, -1, -1):
+            if q < 0:
+                # Dead run (complement only): every suffix is rejected
+                word.extend(rng.choice(symbols) for _ in range(remaining + 1))
+                break
+
+            level, power = counts[remaining], k ** remaining
+            count = counts[remaining + 1][q]
+            r = rng.randrange(count if accepted else k * power - count)
+            for col in range(k):
+                dest = table[q * k + col]
+                if dest < 0:
+                    weight = 0 if accepted else power
+                else:
+                    weight = level[dest] if accepted else power - level[dest]
+                if r < weight:
+                    break
+                r -= weight
+            word.append(symbols[col])
+            q = dest
+
+        return "".join(word)
+
+    def _next(self, q: int, pos: int) -> int:
+        if q < 0:
+            return DEAD
+        return self.dfa.table[q * self.dfa.num_symbols + self.order[pos]]
+
+    def _weights(self, remaining: int, q: int, accepted: bool) -> List[int]:
+        # Completions of length remaining after each symbol from q, in
+        # canonical symbol order
+        self.extend(remaining)
+        level, power = self.counts[remaining], self.dfa.num_symbols ** remaining
+        weights = []
+        for pos in range(len(self.order)):
+            dest = self._next(q, pos)
+            if dest < 0:
+                weights.append(0 if accepted else power)
+            else:
+                weights.append(level[dest] if accepted else power - level[dest])
+        return weights
+
+    def iter_length(self, length: int, skip: int = 0, accepted: bool = True) -> Iterator[str]:
+        # Words of this length in lexicographic order, from the skip-th one
+        if skip >= self.total(length, accepted):
+            return
+        symbols = [self.dfa.symbols[col] for col in self.order]
+        k = len(symbols)
+
+        # Descend straight to the skip-th word
+        positions, states = [], [self.dfa.initial]
+        for depth in range(length):
+            weights = self._weights(length - depth - 1, states[depth], accepted)
+            pos = 0
+            while skip >= weights[pos]:
+                skip -= weights[pos]
+                pos += 1
+            positions.append(pos)
+            states.append(self._next(states[depth], pos))
+
+        while True:
+            yield "".join(symbols[pos] for pos in positions)
+
+            # Backtrack to the deepest position with a later viable symbol,
+            # then take the first viable symbol at every position below it
+            depth = length - 1
+            while depth >= 0:
+                weights = self._weights(length - depth - 1, states[depth], accepted)
+                pos = next((p for p in range(positions[depth] + 1, k) if weights[p]), None)
+                if pos is not None:
+                    break
+                depth -= 1
+            if depth < 0:
+                return
+
+            positions[depth] = pos
+            states[depth + 1] = self._next(states[depth], pos)
+            for d in range(depth + 1, length):
+                weights = self._weights(length - d - 1, states[d], accepted)
+                positions[d] = next(p for p in range(k) if weights[p])
+                states[d + 1] = self._next(states[d], positions[d])
+
+    def rank(self, word: str, accepted: bool = True) -> int:
+        columns = self.dfa.columns
+        index = sum(self.total(length, accepted) for length in range(len(word)))
+
+        q = self.dfa.initial
+        for depth, symbol in enumerate(word):
+            col = columns.get(symbol)
+            if col is None:
+                raise ValueError(f"Symbol {symbol} not in alphabet")
+            pos = self.positions[col]
+            index += sum(self._weights(len(word) - depth - 1, q, accepted)[:pos])
+            q = self._next(q, pos)
+
+        if self.dfa.is_accepting_state(q) != accepted:
+            side = "accepted" if accepted else "rejected"
+            raise ValueError(f"Word {word!r} is not {side} by the automaton")
+        return index
+
+    def unrank(self, index: int, max_length: Optional[int], accepted: bool = True) -> str:
+        # max_length bounds the search for finite languages (None if infinite)
+        if index < 0:
+            raise ValueError("Index must be non-negative")
+        length, skipped = 0, 0
+        while max_length is None or length <= max_length:
+            total = self.total(length, accepted)
+            if index - skipped < total:
+                return next(self.iter_length(length, index - skipped, accepted))
+            skipped += total
+            length += 1
+        raise ValueError(f"Index {index} out of range for a language of {skipped} words")
+
+
+def cached_path_counts(automaton: Automaton) -> PathCounts:
+    return memoize(automaton, "path_counts", lambda a: PathCounts(cached_compiled(a)))
+
+
+def count_words(automaton: Automaton, length: int) -> int:
+    return cached_path_counts(automaton).count(length)
+
+
+def count_words_upto(automaton: Automaton, max_length: int) -> int:
+    counts = cached_path_counts(automaton)
+    return sum(counts.count(i) for i in range(max_length + 1))
+
+
+def sample_words(
+    automaton: Automaton,
+    length: int,
+    count: int = 1,
+    accepted: bool = True,
+    rng: Optional[random.Random] = None
+) -> List[str]:
+    # Independent uniform draws (with repetition); empty when there is no
+    # word of this length to draw from
+    counts = cached_path_counts(automaton)
+    rng = rng or random.Random()
+    if length < 0 or counts.total(length, accepted) == 0:
+        return []
+    return [counts.sample(length, rng, accepted) for _ in range(count)]
+
+
+def _useful_states(table: List[int], k: int, initial: int, finals: List[bool]) -> bytearray:
+    n = len(finals)
+
+    reachable = bytearray(n)
+    reachable[initial] = 1
+    stack = [initial]
+    predecessors: List[List[int]] = [[] for _ in range(n)]
+    while stack:
+        q = stack.pop()
+        for dest in table[q * k:(q + 1) * k]:
+            predecessors[dest].append(q)
+            if not reachable[dest]:
+                reachable[dest] = 1
+                stack.append(dest)
+
+    # Co-reachability restricted to reachable states
+    useful = bytearray(n)
+    stack = [q for q in range(n) if reachable[q] and finals[q]]
+    for q in stack:
+        useful[q] = 1
+    while stack:
+        q = stack.pop()
+        for src in predecessors[q]:
+            if not useful[src]:
+                useful[src] = 1
+                stack.append(src)
+    return useful
+
+
+def _has_useful_cycle(dfa: CompiledDFA, accepted: bool = True) -> bool:
+    # Completed table with the sink as state n, finals flipped for the
+    # complement; Kahn's algorithm removes every useful state exactly when
+    # there is no cycle among them
+    n, k = dfa.num_states, dfa.num_symbols
+    table = [n if dest < 0 else dest for dest in dfa.table] + [n] * k
+    finals = [bool(f) == accepted for f in dfa.finals] + [not accepted]
+    useful = _useful_states(table, k, dfa.initial, finals)
+
+    indegree = [0] * (n + 1)
+    for q in range(n + 1):
+        if useful[q]:
+            for dest in table[q * k:(q + 1) * k]:
+                if useful[dest]:
+                    indegree[dest] += 1
+
+    stack = [q for q in range(n + 1) if useful[q] and indegree[q] == 0]
+    removed = 0
+    while stack:
+        q = stack.pop()
+        removed += 1
+        for dest in table[q * k:(q + 1) * k]:
+            if useful[dest]:
+                indegree[dest] -= 1
+                if indegree[dest] == 0:
+                    stack.append(dest)
+
+    return removed < sum(useful)
+
+
+def is_infinite(automaton: Automaton) -> bool:
+    # L is infinite iff the trimmed DFA has a cycle
+    return memoize(automaton, "infinite", lambda a: _has_useful_cycle(cached_compiled(a)))
+
+
+def is_finite(automaton: Automaton) -> bool:
+    return not is_infinite(automaton)
+
+
+def _max_length(automaton: Automaton, accepted: bool) -> Optional[int]:
+    # Bound on word lengths when the language (or its complement) is finite:
+    # a longer word would pump a cycle of the completed DFA. None otherwise
+    if accepted:
+        infinite = is_infinite(automaton)
+    else:
+        infinite = memoize(automaton, "complement_infinite", lambda a: _has_useful_cycle(cached_compiled(a), False))
+    return None if infinite else cached_compiled(automaton).num_states
+
+
+def iter_words(
+    automaton: Automaton,
+    order: str = "shortlex",
+    start: int = 0,
+    accepted: bool = True
+) -> Iterator[str]:
+    # Lazily yields L(A) (or its complement) from the start-th word on
+    if order.lower() != "shortlex":
+        raise ValueError(f"Unknown word order: {order}")
+    if start < 0:
+        raise ValueError("Start index must be non-negative")
+
+    counts = cached_path_counts(automaton)
+    max_length = _max_length(automaton, accepted)
+    length = 0
+    while max_length is None or length <= max_length:
+        total = counts.total(length, accepted)
+        if start < total:
+            yield from counts.iter_length(length, start, accepted)
+            start = 0
+        else:
+            start -= total
+        length += 1
+
+
+def rank(automaton: Automaton, word: str, accepted: bool = True) -> int:
+    return cached_path_counts(automaton).rank(word, accepted)
+
+
+def unrank(automaton: Automaton, index: int, accepted: bool = True) -> str:
+    return cached_path_counts(automaton).unrank(index, _max_length(automaton, accepted), accepted)
@@ -1,11 +1,37 @@
-from typing import List, Dict, Set, Optional, Tuple, Iterator
+from typing import List, Dict, Set, Optional, Tuple, Iterable, Iterator, Any
+
+# Symbol used for epsilon (empty word) transitions; it is never part of an Alphabet
+EPSILON = "ε"
 
 
 class State:
     def __init__(self, name: str, is_initial: bool = False, is_final: bool = False):
         self.name = name
-        self.is_initial = is_initial
-        self.is_final = is_final
+        self._is_initial = is_initial
+        self._is_final = is_final
+        # Automata holding this state; flag writes are reported to them so
+        # their initial/final indexes stay in sync
+        self._owners: List["Automaton"] = []
+    
+    @property
+    def is_initial(self) -> bool:
+        return self._is_initial
+    
+    @is_initial.setter
+    def is_initial(self, value: bool) -> None:
+        self._is_initial = value
+        for owner in self._owners:
+            owner._update_flags(self)
+    
+    @property
+    def is_final(self) -> bool:
+        return self._is_final
+    
+    @is_final.setter
+    def is_final(self, value: bool) -> None:
+        self._is_final = value
+        for owner in self._owners:
+            owner._update_flags(self)
     
     def __str__(self) -> str:
         return self.name
@@ -24,6 +50,8 @@ class State:
 
 class Alphabet:
     def __init__(self, symbols: List[str]):
+        if EPSILON in symbols:
+            raise ValueError(f"{EPSILON} is reserved for epsilon transitions and cannot be an alphabet symbol")
         self.symbols = sorted(set(symbols))  # Ensure uniqueness
     
     def __str__(self) -> str:
@@ -54,6 +82,10 @@ class Transition:
     def __repr__(self) -> str:
         return f"Transition({self.src.name}, {self.symbol}, {self.dest.name})"
     
+    @property
+    def is_epsilon(self) -> bool:
+        return self.symbol == EPSILON
+    
     def __eq__(self, other) -> bool:
         if not isinstance(other, Transition):
             return False
@@ -65,51 +97,307 @@ class Transition:
         return hash((self.src, self.symbol, self.dest))
 
 
+def _remove_identical(transitions: List[Transition], transition: Transition) -> None:
+    # Equal transitions may be listed more than once; remove this very object
+    for i, t in enumerate(transitions):
+        if t is transition:
+            del transitions[i]
+            return
+
+
 class Automaton:
     def __init__(self, name: str, alphabet: Alphabet, states: List[State], transitions: List[Transition], creator_id: Optional[str] = None):
         self.name = name
         self.alphabet = alphabet
         self.states = {s.name: s for s in states}  # Map state names to State objects
-        self.transitions = transitions
         self.creator_id = creator_id
         
-        # Build transition function for faster lookup
+        # Transitions in insertion order, keyed by a slot number; _slots maps
+        # each stored Transition object (by identity) to its slot, so removing
+        # or replacing one never scans the others. The transitions property
+        # is a read-only snapshot rebuilt after edits
+        self._transitions: Dict[int, Transition] = {}
+        self._slots: Dict[int, int] = {}
+        self._next_slot = 0
+        self._transition_list: Optional[Tuple[Transition, ...]] = None
+        
+        # Bumped on every edit; derived forms (DFA, compiled tables) are
+        # memoized in _cache and dropped when the automaton changes
+        self.version = 0
+        self._cache: Dict[str, Any] = {}
+        
+        # Transition indexes, kept up to date by the mutating methods:
+        # delta maps (src, symbol) to destinations, reverse_delta maps
+        # (dest, symbol) to sources, and _outgoing/_incoming hold the
+        # transitions leaving/entering each state
         self.delta: Dict[Tuple[str, str], Set[str]] = {}
+        self.reverse_delta: Dict[Tuple[str, str], Set[str]] = {}
+        self._outgoing: Dict[str, List[Transition]] = {}
+        self._incoming: Dict[str, List[Transition]] = {}
         for t in transitions:
-            key = (t.src.name, t.symbol)
-            if key not in self.delta:
-                self.delta[key] = set()
-            self.delta[key].add(t.dest.name)
+            if id(t) not in self._slots:  # The same object listed twice
+                self._store_transition(t)
+                self._index_transition(t)
+        
+        # State indexes: each state name is interned to a stable integer id,
+        # initial and final states are kept as ordered name sets and
+        # finality as a bitmask over the ids. Writes to a state's flags are
+        # reported back through _update_flags
+        self._state_ids: Dict[str, int] = {}
+        self._next_state_id = 0
+        self._initials: Dict[str, None] = {}
+        self._finals: Dict[str, None] = {}
+        self.final_mask = 0
+        for state in self.states.values():
+            self._index_state(state)
+    
+    def _index_state(self, state: State) -> None:
+        if self not in state._owners:
+            state._owners.append(self)
+        state_id = self._state_ids.get(state.name)
+        if state_id is None:
+            state_id = self._next_state_id
+            self._next_state_id += 1
+            self._state_ids[state.name] = state_id
+        if state.is_initial:
+            self._initials[state.name] = None
+        if state.is_final:
+            self._finals[state.name] = None
+            self.final_mask |= 1 << state_id
+    
+    def _unindex_state(self, state_name: str) -> None:
+        owners = self.states[state_name]._owners
+        if self in owners:
+            owners.remove(self)
+        state_id = self._state_ids.pop(state_name)
+        self._initials.pop(state_name, None)
+        self._finals.pop(state_name, None)
+        self.final_mask &= ~(1 << state_id)
+    
+    @property
+    def transitions(self) -> Tuple[Transition, ...]:
+        if self._transition_list is None:
+            self._transition_list = tuple(self._transitions.values())
+        return self._transition_list
+    
+    def _store_transition(self, transition: Transition, slot: Optional[int] = None) -> None:
+        # Appends the transition, or puts it in an existing slot
+        if slot is None:
+            slot = self._next_slot
+            self._next_slot += 1
+        self._transitions[slot] = transition
+        self._slots[id(transition)] = slot
+    
+    def _index_transition(self, transition: Transition) -> None:
+        src, symbol, dest = transition.src.name, transition.symbol, transition.dest.name
+        self.delta.setdefault((src, symbol), set()).add(dest)
+        self.reverse_delta.setdefault((dest, symbol), set()).add(src)
+        self._outgoing.setdefault(src, []).append(transition)
+        self._incoming.setdefault(dest, []).append(transition)
+    
+    def _unindex_transition(self, transition: Transition) -> None:
+        src, symbol, dest = transition.src.name, transition.symbol, transition.dest.name
+        outgoing = self._outgoing[src]
+        _remove_identical(outgoing, transition)
+        _remove_identical(self._incoming[dest], transition)
+        
+        # An identical transition may still be listed; keep its entries then
+        if any(t.symbol == symbol and t.dest.name == dest for t in outgoing):
+            return
+        for index, key, value in ((self.delta, (src, symbol), dest), (self.reverse_delta, (dest, symbol), src)):
+            values = index[key]
+            values.discard(value)
+            if not values:
+                del index[key]
+    
+    def _incident_transitions(self, state_name: str) -> List[Transition]:
+        # Outgoing then incoming transitions, self-loops listed once
+        incident = list(self._outgoing.get(state_name, []))
+        incident.extend(t for t in self._incoming.get(state_name, []) if t.src.name != state_name)
+        return incident
+    
+    def mark_modified(self) -> None:
+        self.version += 1
+        self._cache.clear()
+        self._transition_list = None
     
     def add_state(self, state: State) -> None:
+        if state.name in self.states:
+            self._unindex_state(state.name)  # Replaced by the new State
         self.states[state.name] = state
+        self._index_state(state)
+        self.mark_modified()
+    
+    def _update_flags(self, state: State) -> None:
+        # Called by State when one of its flags is written
+        name = state.name
+        if self.states.get(name) is not state:
+            return
+        if state.is_initial:
+            self._initials[name] = None
+        else:
+            self._initials.pop(name, None)
+        bit = 1 << self._state_ids[name]
+        if state.is_final:
+            self._finals[name] = None
+            self.final_mask |= bit
+        else:
+            self._finals.pop(name, None)
+            self.final_mask &= ~bit
+        self.mark_modified()
+    
+    def set_initial(self, state_name: str, is_initial: bool = True) -> None:
+        # Making a state initial clears the flag on every other state
+        if state_name not in self.states:
+            raise ValueError(f"State {state_name} not in automaton")
+        if is_initial:
+            for name in list(self._initials):
+                if name != state_name:
+                    self.states[name].is_initial = False
+        self.states[state_name].is_initial = is_initial
+    
+    def set_final(self, state_name: str, is_final: bool = True) -> None:
+        if state_name not in self.states:
+            raise ValueError(f"State {state_name} not in automaton")
+        self.states[state_name].is_final = is_final
     
     def add_transition(self, transition: Transition) -> None:
-        self.transitions.append(transition)
+        if id(transition) in self._slots:
+            raise ValueError(f"Transition {transition} already added")
+        self._store_transition(transition)
+        self._index_transition(transition)
+        self.mark_modified()
+    
+    def _stored_transition(self, transition: Transition) -> Transition:
+        # The stored object itself, or else the first stored transition
+        # equal to it among those leaving its source
+        if id(transition) in self._slots:
+            return transition
+        for t in self._outgoing.get(transition.src.name, []):
+            if t == transition:
+                return t
+        raise ValueError(f"Transition {transition} not in automaton")
+    
+    def remove_transition(self, transition: Transition) -> None:
+        stored = self._stored_transition(transition)
+        del self._transitions[self._slots.pop(id(stored))]
+        self._unindex_transition(stored)
+        self.mark_modified()
+    
+    def replace_transition(self, old: Transition, new: Transition) -> None:
+        # The new transition takes the old one's position in transitions
+        stored = self._stored_transition(old)
+        if new is not stored and id(new) in self._slots:
+            raise ValueError(f"Transition {new} already added")
+        slot = self._slots.pop(id(stored))
+        self._unindex_transition(stored)
+        self._store_transition(new, slot)
+        self._index_transition(new)
+        self.mark_modified()
+    
+    def remove_state(self, state_name: str) -> None:
+        # Removes the state together with every transition entering or leaving it
+        if state_name not in self.states:
+            raise ValueError(f"State {state_name} not in automaton")
+        
+        for t in self._incident_transitions(state_name):
+            del self._transitions[self._slots.pop(id(t))]
+            self._unindex_transition(t)
         
-        # Update transition function
-        key = (transition.src.name, transition.symbol)
-        if key not in self.delta:
-            self.delta[key] = set()
-        self.delta[key].add(transition.dest.name)
+        self._unindex_state(state_name)
+        del self.states[state_name]
+        self._outgoing.pop(state_name, None)
+        self._incoming.pop(state_name, None)
+        self.mark_modified()
+    
+    def rename_state(self, old_name: str, new_name: str) -> None:
+        if old_name not in self.states:
+            raise ValueError(f"State {old_name} not in automaton")
+        if new_name == old_name:
+            return
+        if new_name in self.states:
+            raise ValueError(f"State {new_name} already exists")
+        
+        # Only the name-keyed index entries of the incident transitions have
+        # to move. A transition may hold its own State equal to the renamed
+        # one; it is pointed at the automaton's State so the name follows
+        state = self.states[old_name]
+        incident = self._incident_transitions(old_name)
+        for t in incident:
+            self._unindex_transition(t)
+            if t.src.name == old_name:
+                t.src = state
+            if t.dest.name == old_name:
+                t.dest = state
+        
+        del self.states[old_name]
+        state.name = new_name
+        self.states[new_name] = state
+        self._state_ids[new_name] = self._state_ids.pop(old_name)
+        for names in (self._initials, self._finals):
+            if old_name in names:
+                del names[old_name]
+                names[new_name] = None
+        self._outgoing.pop(old_name, None)
+        self._incoming.pop(old_name, None)
+        
+        for t in incident:
+            self._index_transition(t)
+        self.mark_modified()
     
     def get_initial(self) -> State:
-        initials = [s for s in self.states.values() if s.is_initial]
-        if len(initials) != 1:
-            raise ValueError(f"Expected exactly one initial state, found {len(initials)}")
-        return initials[0]
+        if len(self._initials) != 1:
+            raise ValueError(f"Expected exactly one initial state, found {len(self._initials)}")
+        return self.states[next(iter(self._initials))]
+    
+    def get_initials(self) -> List[State]:
+        return [self.states[name] for name in self._initials]
     
     def get_finals(self) -> List[State]:
-        return [s for s in self.states.values() if s.is_final]
+        return [self.states[name] for name in self._finals]
+    
+    def is_final(self, state_name: str) -> bool:
+        return state_name in self._finals
+    
+    def state_id(self, state_name: str) -> int:
+        return self._state_ids[state_name]
+    
+    def state_mask(self, state_names: Iterable[str]) -> int:
+        # Bitmask of a set of states over their ids; a set contains a final
+        # state iff state_mask(names) & final_mask
+        mask = 0
+        for name in state_names:
+            mask |= 1 << self._state_ids[name]
+        return mask
     
     def get_transitions_from(self, state_name: str, symbol: Optional[str] = None) -> List[Transition]:
+        outgoing = self._outgoing.get(state_name, [])
+        if symbol is None:
+            return list(outgoing)
+        return [t for t in outgoing if t.symbol == symbol]
+    
+    def get_transitions_to(self, state_name: str, symbol: Optional[str] = None) -> List[Transition]:
+        incoming = self._incoming.get(state_name, [])
         if symbol is None:
-            return [t for t in self.transitions if t.src.name == state_name]
-        return [t for t in self.transitions if t.src.name == state_name and t.symbol == symbol]
+            return list(incoming)
+        return [t for t in incoming if t.symbol == symbol]
     
     def next_states(self, state_name: str, symbol: str) -> Set[str]:
         key = (state_name, symbol)
         return self.delta.get(key, set())
     
+    def previous_states(self, state_name: str, symbol: str) -> Set[str]:
+        key = (state_name, symbol)
+        return self.reverse_delta.get(key, set())
+    
+    def successors(self, state_name: str) -> Set[str]:
+        return {t.dest.name for t in self._outgoing.get(state_name, [])}
+    
+    def predecessors(self, state_name: str) -> Set[str]:
+        return {t.src.name for t in self._incoming.get(state_name, [])}
+    
+    def has_epsilon_transitions(self) -> bool:
+        return any(symbol == EPSILON and dests for (_, symbol), dests in self.delta.items())
+    
     def __str__(self) -> str:
         return f"Automaton {self.name} with {len(self.states)} states and {len(self.transitions)} transitions" 
\ No newline at end of file
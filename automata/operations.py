@@ -1,20 +1,29 @@
-from typing import Dict, List, Set, Tuple, Optional, Any, Iterator
-from itertools import product
+from typing import Callable, Dict, List, Set, Tuple, Optional, Any, Iterator
 from collections import deque
 
 from .models import State, Alphabet, Transition, Automaton
+from .compact import CompactAutomaton, make_step
+
+# When True, every operation below trims its result (see trim()) so later
+# stages never carry unreachable or dead states
+AUTO_TRIM = False
+# Subsets explored per direction when minimize_automaton(method="auto")
+# chooses between Hopcroft and Brzozowski
+MINIMIZATION_PROBE_STATES = 2000
 
 
 def is_deterministic(automaton: Automaton) -> bool:
-    initial_states = [s for s in automaton.states.values() if s.is_initial]
-    if len(initial_states) != 1:
+    if len(automaton.get_initials()) != 1:
         return False
     
-    for state_name in automaton.states:
-        for symbol in automaton.alphabet:
-            next_states = automaton.next_states(state_name, symbol)
-            if len(next_states) > 1:
-                return False
+    if automaton.has_epsilon_transitions():
+        return False
+    
+    # Only (state, symbol) pairs that have transitions are looked at
+    alphabet = set(automaton.alphabet.symbols)
+    for (state_name, symbol), next_states in automaton.delta.items():
+        if len(next_states) > 1 and symbol in alphabet:
+            return False
     
     return True
 
@@ -29,17 +38,72 @@ def is_complete(automaton: Automaton) -> bool:
     return True
 
 
+def _search(roots: List[str], neighbours: Callable[[str], Set[str]]) -> Set[str]:
+    seen = set(roots)
+    stack = list(seen)
+    while stack:
+        for name in neighbours(stack.pop()):
+            if name not in seen:
+                seen.add(name)
+                stack.append(name)
+    return seen
+
+
+def _restrict(automaton: Automaton, keep: Set[str]) -> Automaton:
+    if len(keep) == len(automaton.states):
+        return automaton  # Nothing to remove
+    
+    states = [
+        State(s.name, s.is_initial, s.is_final)
+        for s in automaton.states.values() if s.name in keep
+    ]
+    state_lookup = {s.name: s for s in states}
+    transitions = [
+        Transition(state_lookup[t.src.name], t.symbol, state_lookup[t.dest.name])
+        for t in automaton.transitions
+        if t.src.name in state_lookup and t.dest.name in state_lookup
+    ]
+    return Automaton(automaton.name, automaton.alphabet, states, transitions, automaton.creator_id)
+
+
+def _reachable_part(automaton: Automaton) -> Automaton:
+    initial = [s.name for s in automaton.get_initials()]
+    return _restrict(automaton, _search(initial, automaton.successors))
+
+
+def trim(automaton: Automaton) -> Automaton:
+    # Keep the states that are both reachable (forward search from the
+    # initial states) and co-reachable (backward search from the finals),
+    # following the automaton's forward and reverse transition indexes
+    initial = [s.name for s in automaton.get_initials()]
+    finals = [s.name for s in automaton.get_finals()]
+    useful = _search(initial, automaton.successors) & _search(finals, automaton.predecessors)
+    
+    # Initial states stay even when useless, so an empty language keeps one
+    return _restrict(automaton, useful | set(initial))
+
+
+def _auto_trim(automaton: Automaton) -> Automaton:
+    return trim(automaton) if AUTO_TRIM else automaton
+
+
 def make_complete(automaton: Automaton) -> Automaton:
+    if AUTO_TRIM:
+        # Only unreachable states can go: dead ones are still needed to
+        # complete the automaton
+        automaton = _reachable_part(automaton)
+    
     if is_complete(automaton):
         return automaton  # Already complete
     
     # Create a copy of the states and transitions
     states = [State(s.name, s.is_initial, s.is_final) for s in automaton.states.values()]
+    state_lookup = {s.name: s for s in states}
     transitions = [
         Transition(
-            next(s for s in states if s.name == t.src.name),
+            state_lookup[t.src.name],
             t.symbol,
-            next(s for s in states if s.name == t.dest.name)
+            state_lookup[t.dest.name]
         ) for t in automaton.transitions
     ]
     
@@ -70,60 +134,11 @@ def make_complete(automaton: Automaton) -> Automaton:
 
 def nfa_to_dfa(automaton: Automaton) -> Automaton:
     if is_deterministic(automaton):
-        return automaton  # Already deterministic
-    
-    # Get initial state and create a set of its name
-    initial_state = automaton.get_initial()
-    initial_set = frozenset([initial_state.name])
-    
-    # Map from state sets to DFA state names
-    state_sets: Dict[frozenset, str] = {initial_set: "q0"}
-    
-    # List of state sets to process
-    queue = deque([initial_set])
-    
-    # New DFA states and transitions
-    dfa_states: List[State] = []
-    dfa_transitions: List[Transition] = []
-    
-    # Create initial state for DFA
-    is_initial_final = any(automaton.states[name].is_final for name in initial_set)
-    dfa_states.append(State("q0", True, is_initial_final))
-    
-    # Process state sets
-    while queue:
-        current_set = queue.popleft()
-        current_name = state_sets[current_set]
-        
-        # For each symbol, compute next state set
-        for symbol in automaton.alphabet:
-            next_set = set()
-            for state_name in current_set:
-                next_set.update(automaton.next_states(state_name, symbol))
-            
-            if not next_set:
-                continue  # No transition for this symbol
-            
-            next_frozen = frozenset(next_set)
-            
-            # Create new DFA state if needed
-            if next_frozen not in state_sets:
-                new_name = f"q{len(state_sets)}"
-                state_sets[next_frozen] = new_name
-                
-                # Check if the new state should be final
-                is_final = any(automaton.states[name].is_final for name in next_set)
-                
-                dfa_states.append(State(new_name, False, is_final))
-                queue.append(next_frozen)
-            
-            # Add transition
-            src_state = next(s for s in dfa_states if s.name == current_name)
-            dest_state = next(s for s in dfa_states if s.name == state_sets[next_frozen])
-            dfa_transitions.append(Transition(src_state, symbol, dest_state))
+        return _auto_trim(automaton)  # Already deterministic
     
-    # Create new automaton
-    return Automaton(f"{automaton.name}_dfa", automaton.alphabet, dfa_states, dfa_transitions)
+    # Bitset subset construction over integer-indexed states
+    dfa = CompactAutomaton.from_automaton(automaton).determinize()
+    return _auto_trim(dfa.to_automaton(f"{automaton.name}_dfa"))
 
 
 def _get_clean_name(name: str) -> str:
@@ -140,17 +155,14 @@ def _get_clean_name(name: str) -> str:
     return base_name
 
 
-def minimize_automaton(automaton: Automaton) -> Automaton:
-    # Ensure the automaton is deterministic and complete
-    if not is_deterministic(automaton):
-        automaton = nfa_to_dfa(automaton)
-    
-    if not is_complete(automaton):
-        automaton = make_complete(automaton)
+def _moore_partition(automaton: Automaton) -> List[Set[str]]:
+    # Reference Moore-style refinement, kept for differential checks
+    # against _hopcroft_partition. Only reachable states are partitioned
+    reachable = _search([s.name for s in automaton.get_initials()], automaton.successors)
     
     # Get final and non-final states
-    final_states = {s.name for s in automaton.states.values() if s.is_final}
-    non_final_states = {s.name for s in automaton.states.values() if not s.is_final}
+    final_states = {name for name in reachable if automaton.is_final(name)}
+    non_final_states = reachable - final_states
     
     # Initial partition
     partitions = []
@@ -204,10 +216,103 @@ def minimize_automaton(automaton: Automaton) -> Automaton:
         
         partitions = new_partitions
     
-    # Create new automaton from partitions
+    return partitions
+
+
+def _hopcroft_partition(automaton: Automaton, partial: bool = False) -> List[Set[str]]:
+    # Hopcroft's refinement on a DFA, over the reachable states only. States
+    # are integers and block_of maps each state to its block; a splitter is
+    # a whole block whose incoming transitions are grouped by symbol, so a
+    # split costs only the transitions entering the splitter and the total
+    # is O(m log n) in the number of transitions, whatever the alphabet size.
+    #
+    # With partial=True the DFA may have missing transitions (Valmari–Lehtinen):
+    # only co-reachable states are kept as well, missing transitions act as
+    # an implicit sink, and every initial block is a splitter since the set
+    # of all states no longer is one
+    names = list(automaton.states)
+    state_index = {name: q for q, name in enumerate(names)}
+    initial = [s.name for s in automaton.get_initials()]
+    useful_names = _search(initial, automaton.successors)
+    if partial:
+        finals = [s.name for s in automaton.get_finals()]
+        useful_names &= _search(finals, automaton.predecessors)
+        useful_names.update(initial)
+    useful = {state_index[name] for name in useful_names}
+    
+    # preds[q] lists the (symbol, source) pairs of the transitions entering
+    # q, read off the automaton's reverse index
+    preds: Dict[int, List[Tuple[str, int]]] = {}
+    alphabet = set(automaton.alphabet.symbols)
+    for (dest_name, symbol), sources in automaton.reverse_delta.items():
+        if dest_name not in useful_names or symbol not in alphabet:
+            continue  # Pruned state or symbol outside the alphabet
+        entering = preds.setdefault(state_index[dest_name], [])
+        entering.extend((symbol, state_index[src]) for src in sources if src in useful_names)
+    
+    final_block = {q for q in useful if automaton.is_final(names[q])}
+    blocks: List[Set[int]] = [b for b in (final_block, useful - final_block) if b]
+    block_of = [0] * len(names)
+    for b, block in enumerate(blocks):
+        for q in block:
+            block_of[q] = b
+    
+    if partial:
+        worklist = list(range(len(blocks)))
+    elif len(blocks) == 2:
+        # On a complete DFA the smaller initial block is a sufficient splitter
+        worklist = [0 if len(blocks[0]) <= len(blocks[1]) else 1]
+    else:
+        worklist = []
+    pending: Set[int] = set(worklist)
+    
+    while worklist:
+        b = worklist.pop()
+        pending.discard(b)
+        
+        # Sources of the transitions entering the splitter, by symbol
+        by_symbol: Dict[str, List[int]] = {}
+        for q in list(blocks[b]):
+            for symbol, p in preds.get(q, ()):
+                by_symbol.setdefault(symbol, []).append(p)
+        
+        for sources in by_symbol.values():
+            # Group the sources by their current block
+            touched: Dict[int, List[int]] = {}
+            for p in sources:
+                touched.setdefault(block_of[p], []).append(p)
+            
+            for c, moving in touched.items():
+                if len(moving) == len(blocks[c]):
+                    continue  # Whole block reaches the splitter, no split
+                
+                # Move the states reaching the splitter into a new block
+                new_block = set(moving)
+                blocks[c] -= new_block
+                new_id = len(blocks)
+                blocks.append(new_block)
+                for q in new_block:
+                    block_of[q] = new_id
+                
+                if c in pending:
+                    entry = new_id
+                else:
+                    entry = new_id if len(new_block) <= len(blocks[c]) else c
+                worklist.append(entry)
+                pending.add(entry)
+    
+    return [{names[q] for q in block} for block in blocks]
+
+
+def _build_quotient(automaton: Automaton, partitions: List[Set[str]]) -> Automaton:
+    # Keep the order of the original states for a stable result
+    order = {name: i for i, name in enumerate(automaton.states)}
+    partitions = sorted(partitions, key=lambda p: min(order[name] for name in p))
+    
     states = []
     transitions = []
-    partition_to_name = {}
+    block_of: Dict[str, int] = {}
+    block_states: List[State] = []
     
     # Try to preserve original state names when a partition has only one state
     for i, partition in enumerate(partitions):
@@ -217,39 +322,37 @@ def minimize_automaton(automaton: Automaton) -> Automaton:
         else:
             # For partitions with multiple states, try to use one of the original names
             # Prefer initial states or states with shorter names
-            sorted_names = sorted(partition, key=lambda x: (not automaton.states[x].is_initial, len(x)))
+            sorted_names = sorted(partition, key=lambda x: (not automaton.states[x].is_initial, len(x), x))
             name = sorted_names[0] if sorted_names else f"q{i}"
-            
-        partition_to_name[frozenset(partition)] = name
+        
+        for state_name in partition:
+            block_of[state_name] = i
         
         # Determine if this partition is initial or final
         is_initial = any(automaton.states[s].is_initial for s in partition)
-        is_final = any(automaton.states[s].is_final for s in partition)
+        is_final = bool(automaton.state_mask(partition) & automaton.final_mask)
         
-        states.append(State(name, is_initial, is_final))
+        state = State(name, is_initial, is_final)
+        states.append(state)
+        block_states.append(state)
     
     # Create transitions
-    for partition in partitions:
+    alphabet = set(automaton.alphabet.symbols)
+    for i, partition in enumerate(partitions):
         # Take a representative state from the partition
         rep_state_name = next(iter(partition))
-        src_name = partition_to_name[frozenset(partition)]
-        src_state = next(s for s in states if s.name == src_name)
+        src_state = block_states[i]
         
-        for symbol in automaton.alphabet:
-            dest_names = automaton.next_states(rep_state_name, symbol)
-            if not dest_names:
-                continue
-            
-            dest_name = next(iter(dest_names))  # For a DFA, there's only one
-            
-            # Find which partition contains the destination state
-            for p in partitions:
-                if dest_name in p:
-                    dest_partition = p
-                    break
-            
-            dest_state_name = partition_to_name[frozenset(dest_partition)]
-            dest_state = next(s for s in states if s.name == dest_state_name)
+        # Outgoing transitions only, in alphabet order
+        seen_symbols: Set[str] = set()
+        for t in sorted(automaton.get_transitions_from(rep_state_name), key=lambda t: t.symbol):
+            symbol, dest_name = t.symbol, t.dest.name
+            if symbol not in alphabet or symbol in seen_symbols:
+                continue  # For a DFA, there's only one per symbol
+            seen_symbols.add(symbol)
+            if dest_name not in block_of:
+                continue  # Dead state dropped by partial minimization
+            dest_state = block_states[block_of[dest_name]]
             
             transitions.append(Transition(src_state, symbol, dest_state))
     
@@ -258,114 +361,179 @@ def minimize_automaton(automaton: Automaton) -> Automaton:
     return Automaton(f"{clean_name}_min", automaton.alphabet, states, transitions)
 
 
-def union(automaton1: Automaton, automaton2: Automaton) -> Automaton:
-    # Check that alphabets are the same
-    if set(automaton1.alphabet.symbols) != set(automaton2.alphabet.symbols):
-        raise ValueError("Automata must have the same alphabet for union operation")
-    
-    # Convert to DFAs
-    dfa1 = nfa_to_dfa(automaton1)
-    dfa2 = nfa_to_dfa(automaton2)
+def minimize_brzozowski(automaton: Automaton) -> Automaton:
+    # Brzozowski's double reversal: determinizing the reverse of an
+    # automaton whose states are all reachable gives the minimal DFA of the
+    # reversed language, so two reverse-and-determinize passes give the
+    # minimal DFA of L straight from an NFA, with no partition refinement.
+    # The result is partial (no sink state)
+    compact = CompactAutomaton.from_automaton(automaton)
+    minimal = compact.reverse_determinize().reverse_determinize()
+    clean_name = _get_clean_name(automaton.name)
+    return _auto_trim(minimal.to_automaton(f"{clean_name}_min"))
+
+
+def _subsets_within(successors: List[List[int]], initial_mask: int, limit: int) -> bool:
+    # Whether the subset construction from initial_mask stays within limit
+    # subsets; stops as soon as it does not
+    step = make_step(successors)
+    seen = {initial_mask}
+    queue = [initial_mask]
+    for mask in queue:
+        for col in range(len(successors)):
+            next_mask = step(mask, col)
+            if next_mask and next_mask not in seen:
+                if len(seen) >= limit:
+                    return False
+                seen.add(next_mask)
+                queue.append(next_mask)
+    return True
+
+
+def _choose_minimization_method(automaton: Automaton) -> str:
+    # Probe both subset constructions with a bounded budget: when the
+    # forward one is small, determinize and refine; when only the reverse
+    # one is, Brzozowski never builds the large non-minimal DFA
+    if is_deterministic(automaton):
+        return "hopcroft"
+    compact = CompactAutomaton.from_automaton(automaton)
+    if _subsets_within(compact.successor_masks(), compact.initial_mask, MINIMIZATION_PROBE_STATES):
+        return "hopcroft"
+    masks, initial_mask = compact.reversed_successor_masks()
+    if _subsets_within(masks, initial_mask, MINIMIZATION_PROBE_STATES):
+        return "brzozowski"
+    return "hopcroft"
+
+
+def minimize_automaton(automaton: Automaton, method: str = "hopcroft") -> Automaton:
+    method = method.lower()
+    if method == "auto":
+        method = _choose_minimization_method(automaton)
+    if method == "brzozowski":
+        return minimize_brzozowski(automaton)
     
-    # Create product automaton
-    alphabet = Alphabet(automaton1.alphabet.symbols)
+    # Ensure the automaton is deterministic and complete
+    if not is_deterministic(automaton):
+        automaton = nfa_to_dfa(automaton)
+    automaton = _auto_trim(automaton)
     
-    # Create simplified state names to prevent concatenating long names
-    state_pairs = {}
-    next_state_id = 0
+    if method == "valmari":
+        # Works on the partial DFA directly, no sink state is added
+        return _auto_trim(_build_quotient(automaton, _hopcroft_partition(automaton, partial=True)))
     
-    # Create states for the product automaton
-    states = []
-    for s1 in dfa1.states.values():
-        for s2 in dfa2.states.values():
-            # Use a simple Q-index naming scheme but track the state pair
-            state_pair = (s1.name, s2.name)
-            state_name = f"q{next_state_id}"
-            next_state_id += 1
-            state_pairs[state_pair] = state_name
-            
-            is_initial = s1.is_initial and s2.is_initial
-            is_final = s1.is_final or s2.is_final  # Union: accept if either accepts
-            states.append(State(state_name, is_initial, is_final))
+    if not is_complete(automaton):
+        automaton = make_complete(automaton)
     
-    # Create transitions
-    transitions = []
-    for trans1 in dfa1.transitions:
-        for trans2 in dfa2.transitions:
-            if trans1.symbol == trans2.symbol:
-                # Get the simple state names from our mapping
-                src_pair = (trans1.src.name, trans2.src.name)
-                dest_pair = (trans1.dest.name, trans2.dest.name)
-                
-                if src_pair in state_pairs and dest_pair in state_pairs:
-                    src_name = state_pairs[src_pair]
-                    dest_name = state_pairs[dest_pair]
-                    
-                    src_state = next(s for s in states if s.name == src_name)
-                    dest_state = next(s for s in states if s.name == dest_name)
-                    
-                    transitions.append(Transition(src_state, trans1.symbol, dest_state))
+    if method == "hopcroft":
+        partitions = _hopcroft_partition(automaton)
+    elif method == "moore":
+        partitions = _moore_partition(automaton)
+    else:
+        raise ValueError(f"Unknown minimization method: {method}")
     
-    # Create result with clean names to prevent excessive name length
-    name1 = _get_clean_name(dfa1.name)
-    name2 = _get_clean_name(dfa2.name)
-    result = Automaton(f"{name1}_union_{name2}", alphabet, states, transitions)
-    return minimize_automaton(result)
+    return _auto_trim(_build_quotient(automaton, partitions))
 
 
-def intersection(automaton1: Automaton, automaton2: Automaton) -> Automaton:
+# Boolean combinators for product(); each maps (final in A, final in B) to
+# finality of the pair, paired with the name used for the result
+_PRODUCT_OPERATIONS = {
+    "and": (lambda x, y: x and y, "intersect"),
+    "or": (lambda x, y: x or y, "union"),
+    "xor": (lambda x, y: x != y, "xor"),
+    "difference": (lambda x, y: x and not y, "minus"),
+}
+
+
+def _dense_delta(compact: CompactAutomaton) -> List[int]:
+    # Flat state x symbol table of a deterministic CompactAutomaton, -1 where
+    # a transition is missing
+    offsets, targets = compact.offsets, compact.targets
+    return [
+        targets[offsets[slot]] if offsets[slot] != offsets[slot + 1] else -1
+        for slot in range(len(offsets) - 1)
+    ]
+
+
+def product(automaton1: Automaton, automaton2: Automaton, operation: str = "and") -> Automaton:
     # Check that alphabets are the same
     if set(automaton1.alphabet.symbols) != set(automaton2.alphabet.symbols):
-        raise ValueError("Automata must have the same alphabet for intersection operation")
+        raise ValueError("Automata must have the same alphabet for product operation")
+    
+    operation = operation.lower()
+    if operation not in _PRODUCT_OPERATIONS:
+        raise ValueError(f"Unknown product operation: {operation}")
+    combine, label = _PRODUCT_OPERATIONS[operation]
     
     # Convert to DFAs
     dfa1 = nfa_to_dfa(automaton1)
     dfa2 = nfa_to_dfa(automaton2)
-    
-    # Create product automaton
-    alphabet = Alphabet(automaton1.alphabet.symbols)
-    
-    # Create simplified state names to prevent concatenating long names
-    state_pairs = {}
-    next_state_id = 0
-    
-    # Create states for the product automaton
-    states = []
-    for s1 in dfa1.states.values():
-        for s2 in dfa2.states.values():
-            # Use a simple Q-index naming scheme but track the state pair
-            state_pair = (s1.name, s2.name)
-            state_name = f"q{next_state_id}"
-            next_state_id += 1
-            state_pairs[state_pair] = state_name
+    c1 = CompactAutomaton.from_automaton(dfa1)
+    c2 = CompactAutomaton.from_automaton(dfa2)
+    delta1, delta2 = _dense_delta(c1), _dense_delta(c2)
+    k = c1.num_symbols  # Alphabets are sorted, so columns line up
+    
+    # A missing transition leads to an implicit sink (-1). Pairs whose
+    # finality can no longer change from False are dead and not created
+    sink1_dead = not combine(False, True) and not combine(False, False)
+    sink2_dead = not combine(True, False) and not combine(False, False)
+    
+    def is_dead(p1: int, p2: int) -> bool:
+        return (p1 < 0 and p2 < 0) or (p1 < 0 and sink1_dead) or (p2 < 0 and sink2_dead)
+    
+    def is_final(p1: int, p2: int) -> bool:
+        return combine(p1 >= 0 and bool(c1.finals[p1]), p2 >= 0 and bool(c2.finals[p2]))
+    
+    # Breadth-first exploration of the pairs reachable from the initial pair
+    initial_pair = (c1.initial, c2.initial)
+    pair_ids: Dict[Tuple[int, int], int] = {initial_pair: 0}
+    pairs = [initial_pair]
+    edges: List[Tuple[int, int, int]] = []
+    
+    index = 0
+    while index < len(pairs):
+        p1, p2 = pairs[index]
+        for a in range(k):
+            d1 = delta1[p1 * k + a] if p1 >= 0 else -1
+            d2 = delta2[p2 * k + a] if p2 >= 0 else -1
+            if is_dead(d1, d2):
+                continue
             
-            is_initial = s1.is_initial and s2.is_initial
-            is_final = s1.is_final and s2.is_final  # Intersection: accept if both accept
-            states.append(State(state_name, is_initial, is_final))
-    
-    # Create transitions
-    transitions = []
-    for trans1 in dfa1.transitions:
-        for trans2 in dfa2.transitions:
-            if trans1.symbol == trans2.symbol:
-                # Get the simple state names from our mapping
-                src_pair = (trans1.src.name, trans2.src.name)
-                dest_pair = (trans1.dest.name, trans2.dest.name)
-                
-                if src_pair in state_pairs and dest_pair in state_pairs:
-                    src_name = state_pairs[src_pair]
-                    dest_name = state_pairs[dest_pair]
-                    
-                    src_state = next(s for s in states if s.name == src_name)
-                    dest_state = next(s for s in states if s.name == dest_name)
-                    
-                    transitions.append(Transition(src_state, trans1.symbol, dest_state))
+            dest = pair_ids.get((d1, d2))
+            if dest is None:
+                dest = len(pairs)
+                pair_ids[(d1, d2)] = dest
+                pairs.append((d1, d2))
+            edges.append((index, a, dest))
+        index += 1
+    
+    # Use a simple Q-index naming scheme to prevent concatenating long names
+    states = [
+        State(f"q{i}", i == 0, is_final(p1, p2))
+        for i, (p1, p2) in enumerate(pairs)
+    ]
+    symbols = c1.symbols
+    transitions = [Transition(states[src], symbols[a], states[dest]) for src, a, dest in edges]
     
     # Create result with clean names to prevent excessive name length
     name1 = _get_clean_name(dfa1.name)
     name2 = _get_clean_name(dfa2.name)
-    result = Automaton(f"{name1}_intersect_{name2}", alphabet, states, transitions)
-    return minimize_automaton(result)
+    return _auto_trim(Automaton(f"{name1}_{label}_{name2}", Alphabet(symbols), states, transitions))
+
+
+def union(automaton1: Automaton, automaton2: Automaton) -> Automaton:
+    # Check that alphabets are the same
+    if set(automaton1.alphabet.symbols) != set(automaton2.alphabet.symbols):
+        raise ValueError("Automata must have the same alphabet for union operation")
+    
+    return minimize_automaton(product(automaton1, automaton2, "or"))
+
+
+def intersection(automaton1: Automaton, automaton2: Automaton) -> Automaton:
+    # Check that alphabets are the same
+    if set(automaton1.alphabet.symbols) != set(automaton2.alphabet.symbols):
+        raise ValueError("Automata must have the same alphabet for intersection operation")
+    
+    return minimize_automaton(product(automaton1, automaton2, "and"))
 
 
 def complement(automaton: Automaton) -> Automaton:
@@ -390,41 +558,212 @@ def complement(automaton: Automaton) -> Automaton:
     
     # Create new automaton with a clean name
     clean_name = _get_clean_name(automaton.name)
-    return Automaton(f"{clean_name}_complement", automaton.alphabet, states, transitions)
+    return _auto_trim(Automaton(f"{clean_name}_complement", automaton.alphabet, states, transitions))
 
 
-def are_equivalent(automaton1: Automaton, automaton2: Automaton) -> bool:
+class _SubsetView:
+    # Determinized view of an automaton: states are bitmasks of original
+    # states built on the fly (single bits for a DFA, 0 for the sink)
+    def __init__(self, automaton: Automaton):
+        compact = CompactAutomaton.from_automaton(automaton)
+        self.symbols = compact.symbols
+        self.initial = compact.initial_mask
+        self.final_mask = compact.final_mask
+        self.step = make_step(compact.successor_masks())
+    
+    def is_final(self, mask: int) -> bool:
+        return bool(mask & self.final_mask)
+
+
+def _hopcroft_karp(view1: _SubsetView, view2: _SubsetView) -> bool:
+    # Hopcroft–Karp: merge the classes of paired states with union-find and
+    # stop at the first pair that disagrees on finality
+    parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    
+    def find(x: Tuple[int, int]) -> Tuple[int, int]:
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while x != root:  # Path compression
+            parent[x], x = root, parent[x]
+        return root
+    
+    start = (view1.initial, view2.initial)
+    parent[(0, start[0])] = (1, start[1])
+    queue = deque([start])
+    
+    while queue:
+        m1, m2 = queue.popleft()
+        if view1.is_final(m1) != view2.is_final(m2):
+            return False
+        
+        for col in range(len(view1.symbols)):
+            n1, n2 = view1.step(m1, col), view2.step(m2, col)
+            r1, r2 = find((0, n1)), find((1, n2))
+            if r1 != r2:
+                parent[r1] = r2
+                queue.append((n1, n2))
+    
+    return True
+
+
+def _shortest_distinguishing_word(view1: _SubsetView, view2: _SubsetView) -> Optional[str]:
+    # Breadth-first search over reachable pairs; the first pair that disagrees
+    # on finality gives a shortest (and shortlex-least) distinguishing word
+    start = (view1.initial, view2.initial)
+    parents: Dict[Tuple[int, int], Optional[Tuple[Tuple[int, int], int]]] = {start: None}
+    queue = deque([start])
+    
+    while queue:
+        pair = queue.popleft()
+        if view1.is_final(pair[0]) != view2.is_final(pair[1]):
+            word = []
+            while parents[pair] is not None:
+                pair, col = parents[pair]
+                word.append(view1.symbols[col])
+            return "".join(reversed(word))
+        
+        for col in range(len(view1.symbols)):
+            nxt = (view1.step(pair[0], col), view2.step(pair[1], col))
+            if nxt not in parents:
+                parents[nxt] = (pair, col)
+                queue.append(nxt)
+    
+    return None
+
+
+def equivalence_counterexample(automaton1: Automaton, automaton2: Automaton) -> Optional[str]:
     # Check that alphabets are the same
     if set(automaton1.alphabet.symbols) != set(automaton2.alphabet.symbols):
         raise ValueError("Automata must have the same alphabet to check equivalence")
     
-    # Convert to minimal DFAs
-    min_dfa1 = minimize_automaton(nfa_to_dfa(automaton1))
-    min_dfa2 = minimize_automaton(nfa_to_dfa(automaton2))
-    
-    # Compare the number of states
-    if len(min_dfa1.states) != len(min_dfa2.states):
-        return False
+    view1, view2 = _SubsetView(automaton1), _SubsetView(automaton2)
+    if _hopcroft_karp(view1, view2):
+        return None
+    return _shortest_distinguishing_word(view1, view2)
+
+
+def are_equivalent(automaton1: Automaton, automaton2: Automaton) -> bool:
+    # Check that alphabets are the same
+    if set(automaton1.alphabet.symbols) != set(automaton2.alphabet.symbols):
+        raise ValueError("Automata must have the same alphabet to check equivalence")
     
-    # Compare the number of final states
-    finals1 = [s for s in min_dfa1.states.values() if s.is_final]
-    finals2 = [s for s in min_dfa2.states.values() if s.is_final]
-    if len(finals1) != len(finals2):
-        return False
+    return _hopcroft_karp(_SubsetView(automaton1), _SubsetView(automaton2))
+
+
+def _forward_simulation(compact: CompactAutomaton, successors: List[List[int]]) -> List[int]:
+    # Maximal forward simulation preorder: bit r of sim[q] is set when r
+    # simulates q (r accepts everything q accepts, step by step)
+    n = compact.num_states
+    all_states = (1 << n) - 1
+    final_mask = compact.final_mask
+    sim = [final_mask if compact.finals[q] else all_states for q in range(n)]
     
-    # Compare transitions (this is a heuristic - we should use a proper isomorphism check)
-    for symbol in min_dfa1.alphabet:
-        transitions1 = [(t.src.name, t.dest.name) for t in min_dfa1.transitions if t.symbol == symbol]
-        transitions2 = [(t.src.name, t.dest.name) for t in min_dfa2.transitions if t.symbol == symbol]
-        if len(transitions1) != len(transitions2):
-            return False
+    changed = True
+    while changed:
+        changed = False
+        for q in range(n):
+            mask = sim[q]
+            candidates = mask
+            while candidates:
+                low = candidates & -candidates
+                r = low.bit_length() - 1
+                candidates ^= low
+                # Every a-successor of q must be simulated by an a-successor of r
+                for row in successors:
+                    succ_q, succ_r = row[q], row[r]
+                    while succ_q:
+                        low_q = succ_q & -succ_q
+                        if not sim[low_q.bit_length() - 1] & succ_r:
+                            break
+                        succ_q ^= low_q
+                    if succ_q:
+                        mask &= ~low
+                        break
+            if mask != sim[q]:
+                sim[q] = mask
+                changed = True
+    return sim
+
+
+def _inclusion_witness(automaton1: Automaton, automaton2: Automaton, use_simulation: bool) -> Optional[str]:
+    # Antichain search over pairs (p, S): p a state of automaton1 and S the
+    # subset of automaton2 states reached by the same word. A pair is only
+    # explored if no explored pair (p, S') has S' ⊆ S (or, with simulation,
+    # every state of S' simulated by a state of S), since S' is harder to
+    # accept from
+    if set(automaton1.alphabet.symbols) != set(automaton2.alphabet.symbols):
+        raise ValueError("Automata must have the same alphabet to check inclusion")
+    
+    c1 = CompactAutomaton.from_automaton(automaton1)
+    c2 = CompactAutomaton.from_automaton(automaton2)
+    k = c1.num_symbols
+    successors1 = c1.successor_masks()
+    successors2 = c2.successor_masks()
+    step2 = make_step(successors2)
+    final2 = c2.final_mask
+    sim = _forward_simulation(c2, successors2) if use_simulation else None
+    
+    def covers(old: int, new: int) -> bool:
+        if sim is None:
+            return old & ~new == 0
+        while old:
+            low = old & -old
+            if not sim[low.bit_length() - 1] & new:
+                return False
+            old ^= low
+        return True
+    
+    def states_of(mask: int) -> Iterator[int]:
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+    
+    # Masks are epsilon-closed, so every state of the initial closure of
+    # automaton1 starts a pair
+    start_subset = c2.initial_mask
+    antichain: Dict[int, List[int]] = {}
+    parents: Dict[Tuple[int, int], Optional[Tuple[Tuple[int, int], int]]] = {}
+    queue = deque()
+    for p in states_of(c1.initial_mask):
+        antichain[p] = [start_subset]
+        parents[(p, start_subset)] = None
+        queue.append((p, start_subset))
     
-    # A more robust approach would be to check if the symmetric difference is empty
-    # Symmetric difference: (A ∪ B) - (A ∩ B)
-    diff = union(
-        intersection(min_dfa1, complement(min_dfa2)),
-        intersection(complement(min_dfa1), min_dfa2)
-    )
+    while queue:
+        node = queue.popleft()
+        p, subset = node
+        if subset not in antichain.get(p, ()):
+            continue  # Superseded by a smaller subset after being queued
+        
+        if c1.finals[p] and not subset & final2:
+            word = []
+            while parents[node] is not None:
+                node, col = parents[node]
+                word.append(c1.symbols[col])
+            return "".join(reversed(word))
+        
+        for col in range(k):
+            next_subset = step2(subset, col)
+            for dest in states_of(successors1[col][p]):
+                chain = antichain.setdefault(dest, [])
+                if any(covers(old, next_subset) for old in chain):
+                    continue
+                chain[:] = [old for old in chain if not covers(next_subset, old)]
+                chain.append(next_subset)
+                
+                child = (dest, next_subset)
+                if child not in parents:
+                    parents[child] = (node, col)
+                queue.append(child)
     
-    # If the symmetric difference has no final states, the languages are equivalent
-    return not any(s.is_final for s in diff.states.values()) 
\ No newline at end of file
+    return None
+
+
+def inclusion_counterexample(automaton1: Automaton, automaton2: Automaton, use_simulation: bool = False) -> Optional[str]:
+    return _inclusion_witness(automaton1, automaton2, use_simulation)
+
+
+def is_subset(automaton1: Automaton, automaton2: Automaton, use_simulation: bool = False) -> bool:
+    return _inclusion_witness(automaton1, automaton2, use_simulation) is None
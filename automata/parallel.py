@@ -0,0 +1,129 @@
+"""
+Parallel batch simulation over a process pool.
+
+The compiled DFA table is copied once into a ``multiprocessing`` shared memory
+block; every worker attaches to it in its initializer and receives only the
+small metadata (symbol columns, finality flags), so tasks carry nothing but
+the words themselves. Words given in memory are sent in ordered chunks; for a
+file of newline-separated words each task is just a byte range and the worker
+reads its own slice.
+"""
+import copy
+import os
+from array import array
+from itertools import islice
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .models import Automaton
+from .compiled import CompiledDFA
+from .cache import cached_compiled
+
+# Words sent to a worker per task
+PARALLEL_CHUNK_SIZE = 16384
+# File byte ranges per worker, so faster workers pick up more of the file
+FILE_RANGES_PER_WORKER = 4
+
+# Per-worker state set by _init_worker()
+_worker_dfa: Optional[CompiledDFA] = None
+_worker_memory: Optional[SharedMemory] = None
+
+
+def _init_worker(dfa: CompiledDFA, memory_name: str, shape: Tuple[int, int]) -> None:
+    global _worker_dfa, _worker_memory
+    _worker_memory = SharedMemory(name=memory_name)
+    dfa._batch_table = np.ndarray(shape, dtype=np.int32, buffer=_worker_memory.buf)
+    _worker_dfa = dfa
+
+
+def _classify_words(words: List[Union[str, bytes]]) -> np.ndarray:
+    return _worker_dfa.accepts_many(words)
+
+
+def _read_lines(file_path: str, start: int, end: int, encoding: str) -> Iterator[str]:
+    # A line belongs to the range in which it starts
+    with open(file_path, 'rb') as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            if line.endswith(b"\n"):
+                line = line[:-1]
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            yield line.decode(encoding)
+
+
+def _classify_range(task: Tuple[str, int, int, str]) -> np.ndarray:
+    file_path, start, end, encoding = task
+    return _worker_dfa.accepts_many(_read_lines(file_path, start, end, encoding))
+
+
+def _chunks(words: Iterable[Union[str, bytes]], size: int) -> Iterator[List[Union[str, bytes]]]:
+    iterator = iter(words)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            break
+        yield chunk
+
+
+def parallel_simulate(
+    automaton: Automaton,
+    words: Union[Iterable[Union[str, bytes]], str, os.PathLike],
+    workers: Optional[int] = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+    encoding: str = "utf-8"
+) -> np.ndarray:
+    # A str or path-like argument is a file with one word per line
+    is_file = isinstance(words, (str, os.PathLike))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    dfa = cached_compiled(automaton)
+    if dfa._batch_table is None:
+        dfa._batch_table = dfa._build_batch_table()
+    table = dfa._batch_table
+
+    if is_file:
+        file_path = os.fspath(words)
+        size = os.path.getsize(file_path)
+        count = max(1, min(workers * FILE_RANGES_PER_WORKER, size))
+        bounds = [size * i // count for i in range(count + 1)]
+        tasks = [(file_path, bounds[i], bounds[i + 1], encoding) for i in range(count)]
+    if workers == 1:
+        if is_file:
+            return np.concatenate([dfa.accepts_many(_read_lines(*task)) for task in tasks])
+        return dfa.accepts_many(words)
+
+    # Workers get the table through shared memory, never through pickling
+    memory = SharedMemory(create=True, size=max(table.nbytes, 1))
+    try:
+        np.ndarray(table.shape, dtype=np.int32, buffer=memory.buf)[:] = table
+        shell = copy.copy(dfa)
+        shell.table = array('i')
+        shell.state_names = ()
+        shell._batch_table = None
+
+        with Pool(workers, initializer=_init_worker, initargs=(shell, memory.name, table.shape)) as pool:
+            if is_file:
+                results = pool.map(_classify_range, tasks)
+            else:
+                results = list(pool.imap(_classify_words, _chunks(words, chunk_size)))
+    finally:
+        memory.close()
+        memory.unlink()
+
+    if not results:
+        return np.zeros(0, dtype=bool)
+    return np.concatenate(results)
@@ -0,0 +1,369 @@
+"""
+Regular expression front-end compiling patterns to Automaton objects.
+
+Supported syntax: literals, ``|`` (alternation), concatenation, postfix ``*``,
+``+`` and ``?``, parentheses, ``.`` (any alphabet symbol), character classes
+``[abc]``, ``[a-z]`` and ``[^...]`` (complement within the alphabet), ``ε`` for
+the empty word and ``\\`` to escape a special character. Symbols are single
+characters.
+
+Two constructions are available: ``glushkov`` builds the position automaton
+(an epsilon-free NFA with one state per symbol occurrence plus an initial
+state) and ``derivatives`` builds a DFA directly from Brzozowski derivatives.
+"""
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .models import State, Alphabet, Transition, Automaton, EPSILON
+
+# Number of compiled patterns kept by the cache
+REGEX_CACHE_SIZE = 256
+
+# Expression nodes are hashable tuples:
+#   ("empty",)          the empty language
+#   ("eps",)            the empty word
+#   ("sym", chars)      one symbol out of a frozenset of characters
+#   ("cat", left, right)
+#   ("alt", options)    alternatives: a tuple in pattern order as parsed, a
+#                       frozenset once normalized for derivatives
+#   ("star", inner)
+#   ("plus", inner)     one or more, kept as a node so the inner expression
+#                       is not copied
+Node = Tuple
+
+EMPTY: Node = ("empty",)
+EPS: Node = ("eps",)
+
+
+class _Parser:
+    def __init__(self, pattern: str, alphabet: Optional[FrozenSet[str]]):
+        self.pattern = pattern
+        self.pos = 0
+        self.alphabet = alphabet
+        self.used: Set[str] = set()
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"{message} at position {self.pos} in pattern {self.pattern!r}")
+
+    def peek(self) -> Optional[str]:
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def take(self) -> str:
+        char = self.pattern[self.pos]
+        self.pos += 1
+        return char
+
+    def parse(self) -> Node:
+        node = self.parse_alt()
+        if self.pos < len(self.pattern):
+            raise self.error("Unexpected ')'")
+        return node
+
+    def parse_alt(self) -> Node:
+        options = [self.parse_cat()]
+        while self.peek() == "|":
+            self.take()
+            options.append(self.parse_cat())
+        return options[0] if len(options) == 1 else ("alt", tuple(options))
+
+    def parse_cat(self) -> Node:
+        node = None
+        while self.peek() is not None and self.peek() not in "|)":
+            item = self.parse_repeat()
+            node = item if node is None else ("cat", node, item)
+        return EPS if node is None else node
+
+    def parse_repeat(self) -> Node:
+        node = self.parse_atom()
+        while self.peek() is not None and self.peek() in "*+?":
+            op = self.take()
+            if op == "*":
+                node = ("star", node)
+            elif op == "+":
+                node = ("plus", node)
+            else:
+                node = ("alt", (node, EPS))
+        return node
+
+    def parse_atom(self) -> Node:
+        char = self.take()
+        if char == "(":
+            node = self.parse_alt()
+            if self.peek() != ")":
+                raise self.error("Missing ')'")
+            self.take()
+            return node
+        if char == "[":
+            return self.parse_class()
+        if char == ".":
+            return self.symbols(self.require_alphabet("'.'"))
+        if char == EPSILON:
+            return EPS
+        if char == "\\":
+            if self.peek() is None:
+                raise self.error("Dangling escape")
+            return self.symbols({self.take()})
+        if char in "*+?":
+            raise self.error(f"Nothing to repeat with '{char}'")
+        if char in ")|":
+            raise self.error(f"Unexpected '{char}'")
+        return self.symbols({char})
+
+    def parse_class(self) -> Node:
+        negate = self.peek() == "^"
+        if negate:
+            self.take()
+
+        chars: Set[str] = set()
+        while self.peek() != "]":
+            if self.peek() is None:
+                raise self.error("Missing ']'")
+            char = self.take()
+            if char == "\\":
+                if self.peek() is None:
+                    raise self.error("Dangling escape")
+                char = self.take()
+            if self.peek() == "-" and self.pos + 1 < len(self.pattern) and self.pattern[self.pos + 1] != "]":
+                self.take()
+                end = self.take()
+                if end == "\\":
+                    if self.peek() is None:
+                        raise self.error("Dangling escape")
+                    end = self.take()
+                if ord(end) < ord(char):
+                    raise self.error(f"Invalid range {char}-{end}")
+                # EPSILON is never a symbol, even inside a range
+                chars.update(chr(c) for c in range(ord(char), ord(end) + 1) if chr(c) != EPSILON)
+            else:
+                chars.add(char)
+        self.take()
+
+        if negate:
+            chars = set(self.require_alphabet("'[^...]'")) - chars
+        elif self.alphabet is not None:
+            # Ranges may cover characters outside an explicit alphabet
+            chars &= self.alphabet
+        return self.symbols(chars)
+
+    def require_alphabet(self, construct: str) -> FrozenSet[str]:
+        if self.alphabet is None:
+            raise self.error(f"{construct} requires an explicit alphabet")
+        return self.alphabet
+
+    def symbols(self, chars: Set[str]) -> Node:
+        if EPSILON in chars:
+            raise self.error(f"{EPSILON} denotes the empty word and cannot be used as a symbol")
+        if self.alphabet is not None:
+            unknown = set(chars) - self.alphabet
+            if unknown:
+                raise self.error(f"Symbol {sorted(unknown)[0]} not in alphabet")
+        self.used.update(chars)
+        return ("sym", frozenset(chars)) if chars else EMPTY
+
+
+# Smart constructors keep expressions in a normal form (associativity,
+# commutativity and idempotence of alternation, unit/zero laws) so that the
+# set of derivatives of an expression is finite
+
+def _cat(left: Node, right: Node) -> Node:
+    if left == EMPTY or right == EMPTY:
+        return EMPTY
+    if left == EPS:
+        return right
+    if right == EPS:
+        return left
+    if left[0] == "cat":
+        return _cat(left[1], _cat(left[2], right))
+    return ("cat", left, right)
+
+
+def _alt(options: List[Node]) -> Node:
+    flat: Set[Node] = set()
+    for option in options:
+        if option[0] == "alt":
+            flat.update(option[1])
+        elif option != EMPTY:
+            flat.add(option)
+    if not flat:
+        return EMPTY
+    if len(flat) == 1:
+        return next(iter(flat))
+    return ("alt", frozenset(flat))
+
+
+def _star(inner: Node) -> Node:
+    if inner in (EMPTY, EPS):
+        return EPS
+    if inner[0] == "star":
+        return inner
+    if inner[0] == "plus":
+        return _star(inner[1])
+    return ("star", inner)
+
+
+def _plus(inner: Node) -> Node:
+    if inner in (EMPTY, EPS) or inner[0] in ("star", "plus"):
+        return inner
+    return ("plus", inner)
+
+
+def _normalize(node: Node) -> Node:
+    kind = node[0]
+    if kind == "cat":
+        return _cat(_normalize(node[1]), _normalize(node[2]))
+    if kind == "alt":
+        return _alt([_normalize(option) for option in node[1]])
+    if kind == "star":
+        return _star(_normalize(node[1]))
+    if kind == "plus":
+        return _plus(_normalize(node[1]))
+    return node
+
+
+def _nullable(node: Node) -> bool:
+    kind = node[0]
+    if kind in ("eps", "star"):
+        return True
+    if kind in ("empty", "sym"):
+        return False
+    if kind == "cat":
+        return _nullable(node[1]) and _nullable(node[2])
+    if kind == "plus":
+        return _nullable(node[1])
+    return any(_nullable(option) for option in node[1])
+
+
+def _derivative(node: Node, symbol: str) -> Node:
+    kind = node[0]
+    if kind in ("empty", "eps"):
+        return EMPTY
+    if kind == "sym":
+        return EPS if symbol in node[1] else EMPTY
+    if kind == "cat":
+        head = _cat(_derivative(node[1], symbol), node[2])
+        if _nullable(node[1]):
+            return _alt([head, _derivative(node[2], symbol)])
+        return head
+    if kind == "alt":
+        return _alt([_derivative(option, symbol) for option in node[1]])
+    if kind == "plus":
+        return _cat(_derivative(node[1], symbol), _star(node[1]))
+    return _cat(_derivative(node[1], symbol), node)
+
+
+# Compiled form: (state names, initial index, final indices, transitions as
+# (src, symbol, dest) index triples); immutable so it can be cached
+_Compiled = Tuple[Tuple[str, ...], int, FrozenSet[int], Tuple[Tuple[int, str, int], ...]]
+
+
+def _glushkov(node: Node) -> _Compiled:
+    # Position automaton: state 0 is initial, state i > 0 is the i-th symbol
+    # occurrence; first/last/follow sets are computed bottom-up
+    positions: List[FrozenSet[str]] = [frozenset()]
+    follow: Dict[int, Set[int]] = {}
+
+    def visit(n: Node) -> Tuple[bool, Set[int], Set[int]]:
+        kind = n[0]
+        if kind == "empty":
+            return False, set(), set()
+        if kind == "eps":
+            return True, set(), set()
+        if kind == "sym":
+            positions.append(n[1])
+            p = len(positions) - 1
+            follow[p] = set()
+            return False, {p}, {p}
+        if kind == "cat":
+            null1, first1, last1 = visit(n[1])
+            null2, first2, last2 = visit(n[2])
+            for p in last1:
+                follow[p] |= first2
+            return (null1 and null2,
+                    first1 | first2 if null1 else first1,
+                    last1 | last2 if null2 else last2)
+        if kind == "alt":
+            nullable, first, last = False, set(), set()
+            for option in n[1]:
+                null_o, first_o, last_o = visit(option)
+                nullable, first, last = nullable or null_o, first | first_o, last | last_o
+            return nullable, first, last
+        # Star and plus: last positions loop back to the first ones
+        nullable, first, last = visit(n[1])
+        for p in last:
+            follow[p] |= first
+        return kind == "star" or nullable, first, last
+
+    nullable, first, last = visit(node)
+    follow[0] = first
+
+    finals = set(last)
+    if nullable:
+        finals.add(0)
+    transitions = tuple(
+        (src, symbol, dest)
+        for src in range(len(positions))
+        for dest in sorted(follow[src])
+        for symbol in sorted(positions[dest])
+    )
+    names = tuple(f"q{i}" for i in range(len(positions)))
+    return names, 0, frozenset(finals), transitions
+
+
+def _brzozowski(node: Node, symbols: Tuple[str, ...]) -> _Compiled:
+    # DFA whose states are the (normalized) derivatives of the expression;
+    # the empty language is left out so the DFA is partial
+    ids: Dict[Node, int] = {node: 0}
+    expressions = [node]
+    transitions: List[Tuple[int, str, int]] = []
+
+    queue = deque([node])
+    while queue:
+        current = queue.popleft()
+        for symbol in symbols:
+            derived = _derivative(current, symbol)
+            if derived == EMPTY:
+                continue
+            if derived not in ids:
+                ids[derived] = len(expressions)
+                expressions.append(derived)
+                queue.append(derived)
+            transitions.append((ids[current], symbol, ids[derived]))
+
+    finals = frozenset(i for i, e in enumerate(expressions) if _nullable(e))
+    names = tuple(f"q{i}" for i in range(len(expressions)))
+    return names, 0, finals, tuple(transitions)
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def _compile_cached(pattern: str, alphabet: Optional[Tuple[str, ...]], method: str) -> Tuple[Tuple[str, ...], _Compiled]:
+    parser = _Parser(pattern, frozenset(alphabet) if alphabet is not None else None)
+    node = parser.parse()
+    symbols = alphabet if alphabet is not None else tuple(sorted(parser.used))
+
+    if method == "glushkov":
+        return symbols, _glushkov(node)
+    elif method == "derivatives":
+        return symbols, _brzozowski(_normalize(node), symbols)
+    else:
+        raise ValueError(f"Unknown regex compilation method: {method}")
+
+
+def compile_regex(
+    pattern: str,
+    alphabet: Optional[List[str]] = None,
+    method: str = "glushkov",
+    name: Optional[str] = None
+) -> Automaton:
+    if alphabet is not None:
+        for symbol in alphabet:
+            if len(symbol) != 1 or symbol == EPSILON:
+                raise ValueError(f"Invalid regex alphabet symbol: {symbol!r}")
+        alphabet = tuple(sorted(set(alphabet)))
+
+    symbols, (names, initial, finals, edges) = _compile_cached(pattern, alphabet, method.lower())
+
+    # Materialize a fresh Automaton on every call since automata are mutable
+    states = [State(n, i == initial, i in finals) for i, n in enumerate(names)]
+    transitions = [Transition(states[src], symbol, states[dest]) for src, symbol, dest in edges]
+    return Automaton(name or pattern, Alphabet(list(symbols)), states, transitions)
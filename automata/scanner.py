@@ -0,0 +1,148 @@
+"""
+Multi-pattern scanning of long texts with many automata at once.
+
+A ``Scanner`` reports every ``(pattern_id, start, end)`` such that
+``text[start:end]`` is a non-empty word accepted by the pattern, keeping for
+each pattern and end offset only the leftmost start. All patterns run in a
+single pass: the combined scanner state is the ordered tuple of active
+``(pattern, state)`` threads, earliest start first, and is determinized lazily
+into a bounded cache. Each cached move stores the successor state, how start
+offsets are carried over, and its output set (the patterns that match there),
+in the manner of Aho–Corasick.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple, Union
+
+from .models import Automaton
+from .cache import cached_compiled
+from .storage import read_text_chunks
+
+# Combined states kept before the scanner cache is flushed
+SCANNER_MAX_STATES = 10000
+# Characters read at a time by scan_file()
+SCAN_CHUNK_SIZE = 1 << 20
+
+Match = Tuple[Any, int, int]
+# Cached move: (next state id, source slot of each next thread, outputs as
+# (pattern index, source slot) pairs). Slot len(threads) stands for the
+# threads started at the current position
+_Move = Tuple[int, Tuple[int, ...], Tuple[Tuple[int, int], ...]]
+
+
+class Scanner:
+    def __init__(
+        self,
+        patterns: Union[Sequence[Automaton], Mapping[Any, Automaton]],
+        max_states: int = SCANNER_MAX_STATES
+    ):
+        if isinstance(patterns, Mapping):
+            self.pattern_ids = list(patterns.keys())
+            automata = list(patterns.values())
+        else:
+            self.pattern_ids = list(range(len(patterns)))
+            automata = list(patterns)
+        if not automata:
+            raise ValueError("Scanner requires at least one pattern")
+
+        self.max_states = max_states
+        self._dfas = [cached_compiled(a) for a in automata]
+
+        # Global columns over the union of all alphabets, translated to each
+        # pattern's own column (-1 when the symbol is not in its alphabet)
+        symbols = sorted({s for dfa in self._dfas for s in dfa.symbols})
+        self.columns: Dict[str, int] = {s: i for i, s in enumerate(symbols)}
+        self._pattern_columns = [
+            [dfa.columns.get(s, -1) for s in symbols] for dfa in self._dfas
+        ]
+        self._start_threads = tuple((p, dfa.initial) for p, dfa in enumerate(self._dfas))
+
+        self.flushes = 0
+        self._reset_cache()
+
+    def _reset_cache(self) -> None:
+        self._threads: List[Tuple[Tuple[int, int], ...]] = []
+        self._ids: Dict[Tuple[Tuple[int, int], ...], int] = {}
+        self._moves: List[Dict[int, _Move]] = []
+        self._intern(())
+
+    def _intern(self, threads: Tuple[Tuple[int, int], ...]) -> int:
+        state_id = self._ids.get(threads)
+        if state_id is None:
+            state_id = len(self._threads)
+            self._ids[threads] = state_id
+            self._threads.append(threads)
+            self._moves.append({})
+        return state_id
+
+    def _compute_move(self, state_id: int, col: int) -> _Move:
+        current = self._threads[state_id]
+        start_slot = len(current)
+
+        next_threads = []
+        sources = []
+        outputs = []
+        seen = set()
+        reported = set()
+        for i, (p, q) in enumerate(current + self._start_threads):
+            pattern_col = self._pattern_columns[p][col]
+            if pattern_col < 0:
+                continue
+            dfa = self._dfas[p]
+            dest = dfa.table[q * dfa.num_symbols + pattern_col]
+            if dest < 0 or (p, dest) in seen:
+                continue  # Dead, or a thread with an earlier start owns it
+            seen.add((p, dest))
+            source = min(i, start_slot)
+            next_threads.append((p, dest))
+            sources.append(source)
+            if dfa.finals[dest] and p not in reported:
+                reported.add(p)
+                outputs.append((p, source))
+
+        if len(self._threads) >= self.max_states:
+            # Flush the whole cache, keeping only the state being left
+            self.flushes += 1
+            self._reset_cache()
+            state_id = self._intern(current)
+
+        move = (self._intern(tuple(next_threads)), tuple(sources), tuple(outputs))
+        self._moves[state_id][col] = move
+        return move
+
+    def scan_iter(self, chunks: Iterable[str]) -> Iterator[Match]:
+        columns, pattern_ids = self.columns, self.pattern_ids
+        state_id, starts, pos = 0, [], 0
+
+        for chunk in chunks:
+            for symbol in chunk:
+                col = columns.get(symbol)
+                if col is None:
+                    # Symbol outside every alphabet: all threads die
+                    state_id, starts = 0, []
+                    pos += 1
+                    continue
+
+                move = self._moves[state_id].get(col)
+                if move is None:
+                    move = self._compute_move(state_id, col)
+                state_id, sources, outputs = move
+
+                starts.append(pos)
+                pos += 1
+                for p, source in outputs:
+                    yield pattern_ids[p], starts[source], pos
+                starts = [starts[i] for i in sources]
+
+    def scan(self, text: str) -> List[Match]:
+        return list(self.scan_iter([text]))
+
+    def scan_file(self, file_path: str, chunk_size: int = SCAN_CHUNK_SIZE, encoding: str = "utf-8") -> Iterator[Match]:
+        # Offsets are character offsets in the decoded file
+        return self.scan_iter(read_text_chunks(file_path, chunk_size, encoding))
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "states": len(self._threads),
+            "max_states": self.max_states,
+            "flushes": self.flushes,
+        }
@@ -1,40 +1,137 @@
-from typing import List, Set, Tuple, Optional, Generator
-from collections import deque
+from typing import List, Set, Tuple, Optional, Generator, Iterable, Union
 import random
 
+import numpy as np
+
 from .models import Automaton
-from .operations import is_deterministic, nfa_to_dfa
+from .compact import CompactAutomaton
+from .operations import is_deterministic, _subsets_within
+from .cache import memoize, cached_dfa, cached_compiled, cached_nfa, cached_lazy_dfa
+from .language import cached_path_counts, iter_words
+from .storage import read_text_chunks
 
 # Maximum length for generated words
 MAX_WORD_LENGTH = 10
 # Maximum attempts when generating words
 MAX_ATTEMPTS = 1000
+# NFAs whose subset construction exceeds this many subsets are determinized
+# lazily instead of up front
+NFA_SIMULATION_PROBE_STATES = 4096
+# Characters read at a time by Runner.feed_file()
+STREAM_CHUNK_SIZE = 1 << 20
 
 
-def simulate(automaton: Automaton, word: str) -> bool:
-    # Convert to DFA for simpler simulation if needed
-    if not is_deterministic(automaton):
-        dfa = nfa_to_dfa(automaton)
-    else:
-        dfa = automaton
-    
-    # Start with the initial state
-    current_state_name = dfa.get_initial().name
-    
-    # Process each symbol in the word
-    for symbol in word:
-        if symbol not in dfa.alphabet:
-            raise ValueError(f"Symbol {symbol} not in alphabet")
-        
-        # Get next state
-        next_states = dfa.next_states(current_state_name, symbol)
-        if not next_states:
-            return False  # No transition, reject
-        
-        current_state_name = next(iter(next_states))  # For a DFA, there's only one
+def _choose_simulation_method(automaton: Automaton) -> str:
+    # Reuse a DFA that is already built; otherwise probe the subset
+    # construction with a bounded budget and only build the full DFA when
+    # it stays small, since even a few dozen NFA states can blow it up
+    if "compiled" in automaton._cache or "dfa" in automaton._cache or is_deterministic(automaton):
+        return "dfa"
+    compact = CompactAutomaton.from_automaton(automaton)
+    if _subsets_within(compact.successor_masks(), compact.initial_mask, NFA_SIMULATION_PROBE_STATES):
+        return "dfa"
+    return "lazy"
+
+
+def _engine(automaton: Automaton, method: str = "auto"):
+    method = method.lower()
+    if method == "auto":
+        method = memoize(automaton, "simulation_method", _choose_simulation_method)
     
-    # Check if final state
-    return dfa.states[current_state_name].is_final
+    if method == "dfa":
+        # Compiled DFA table is built once per automaton version and reused
+        return cached_compiled(automaton)
+    elif method == "nfa":
+        # Bitset simulation of the NFA, no determinization
+        return cached_nfa(automaton)
+    elif method == "lazy":
+        # Subset states built on demand and kept in a bounded cache
+        return cached_lazy_dfa(automaton)
+    else:
+        raise ValueError(f"Unknown simulation method: {method}")
+
+
+def simulate(automaton: Automaton, word: str, method: str = "auto") -> bool:
+    return _engine(automaton, method).accepts(word)
+
+
+def simulate_many(automaton: Automaton, words: Iterable[str]) -> np.ndarray:
+    # Vectorized acceptance: all words advance through the table together
+    return cached_compiled(automaton).accepts_many(words)
+
+
+class Runner:
+    """
+    Resumable simulation of one input delivered in chunks.
+
+    ``feed`` advances the run over a chunk (``str`` or ``bytes``) in constant
+    memory, so inputs from files, sockets or generators never have to be
+    held whole. The run state is a single int (a DFA state, or a state mask
+    for the NFA engines) and ``snapshot``/``restore`` checkpoint it.
+    """
+
+    def __init__(self, automaton: Automaton, method: str = "auto"):
+        self.automaton = automaton
+        self.method = method
+        self._version = automaton.version
+        self._engine = _engine(automaton, method)
+        self.reset()
+
+    def reset(self) -> None:
+        self._state = self._engine.initial_state
+        self.consumed = 0
+
+    def _check_version(self) -> None:
+        if self.automaton.version != self._version:
+            raise ValueError("Automaton was modified since the runner was created")
+
+    def feed(self, chunk: Union[str, bytes]) -> "Runner":
+        self._check_version()
+        self._state = self._engine.run(self._state, chunk)
+        self.consumed += len(chunk)
+        return self
+
+    def feed_all(self, chunks: Iterable[Union[str, bytes]]) -> "Runner":
+        for chunk in chunks:
+            if self.is_dead():
+                break  # Nothing read afterwards can change the outcome
+            self.feed(chunk)
+        return self
+
+    def feed_file(self, file_path: str, chunk_size: int = STREAM_CHUNK_SIZE, encoding: str = "utf-8") -> "Runner":
+        return self.feed_all(read_text_chunks(file_path, chunk_size, encoding))
+
+    @property
+    def state(self) -> int:
+        return self._state
+
+    def is_accepting(self) -> bool:
+        return self._engine.is_accepting_state(self._state)
+
+    def is_dead(self) -> bool:
+        return self._engine.is_dead_state(self._state)
+
+    def snapshot(self) -> Tuple[int, int, int]:
+        return (self._version, self._state, self.consumed)
+
+    def restore(self, snapshot: Tuple[int, int, int]) -> None:
+        version, state, consumed = snapshot
+        if version != self._version:
+            raise ValueError("Snapshot was taken from a different automaton version")
+        self._check_version()
+        self._state = state
+        self.consumed = consumed
+
+
+def simulate_file(
+    automaton: Automaton,
+    file_path: str,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    encoding: str = "utf-8",
+    method: str = "auto"
+) -> bool:
+    # The whole file is one word, read chunk by chunk
+    return Runner(automaton, method).feed_file(file_path, chunk_size, encoding).is_accepting()
 
 
 def _generate_words_dfs(
@@ -43,11 +140,8 @@ def _generate_words_dfs(
     should_accept: bool = True,
     max_count: int = 10
 ) -> List[str]:
-    # Convert to DFA for simpler generation
-    if not is_deterministic(automaton):
-        dfa = nfa_to_dfa(automaton)
-    else:
-        dfa = automaton
+    # Convert to DFA for simpler generation (cached per automaton)
+    dfa = cached_dfa(automaton)
     
     result = []
     stack = [("", dfa.get_initial().name)]
@@ -93,49 +187,13 @@ def _generate_words_bfs(
     should_accept: bool = True,
     max_count: int = 10
 ) -> List[str]:
-    # Convert to DFA for simpler generation
-    if not is_deterministic(automaton):
-        dfa = nfa_to_dfa(automaton)
-    else:
-        dfa = automaton
-    
+    # Shortest words first, in shortlex order, skipping the empty word
     result = []
-    queue = deque([("", dfa.get_initial().name)])
-    visited = set()
-    
-    while queue and len(result) < max_count:
-        word, state_name = queue.popleft()
-        
-        # Track visited state-word combinations to avoid loops
-        if (word, state_name) in visited:
-            continue
-        visited.add((word, state_name))
-        
-        # Check if this word should be accepted
-        if len(word) > 0:
-            is_final = dfa.states[state_name].is_final
-            if is_final == should_accept and word not in result:
-                result.append(word)
-                if len(result) >= max_count:
-                    break
-        
-        # If we're at max length, don't explore further
-        if len(word) >= max_length:
-            continue
-        
-        # Get all possible transitions from the current state
-        transitions = dfa.get_transitions_from(state_name)
-        
-        # Shuffle transitions for more diverse words
-        transitions_list = list(transitions)
-        random.shuffle(transitions_list)
-        
-        for t in transitions_list:
-            new_word = word + t.symbol
-            new_state = t.dest.name
-            
-            # Continue searching
-            queue.append((new_word, new_state))
+    start = cached_path_counts(automaton).total(0, should_accept)
+    for word in iter_words(automaton, start=start, accepted=should_accept):
+        if len(word) > max_length or len(result) >= max_count:
+            break
+        result.append(word)
     
     return result
 
@@ -146,7 +204,9 @@ def generate_accepted_words(
     max_count: int = 10,
     method: str = "bfs"
 ) -> List[str]:
-    if method.lower() == "bfs":
+    if method.lower() == "random":
+        return _generate_random_words(automaton, max_length, True, max_count)
+    elif method.lower() == "bfs":
         return _generate_words_bfs(automaton, max_length, True, max_count)
     else:
         return _generate_words_dfs(automaton, max_length, True, max_count)
@@ -159,30 +219,43 @@ def generate_rejected_words(
     method: str = "random"
 ) -> List[str]:
     if method.lower() == "random":
-        return _generate_random_rejected_words(automaton, max_length, max_count)
+        return _generate_random_words(automaton, max_length, False, max_count)
     elif method.lower() == "bfs":
         return _generate_words_bfs(automaton, max_length, False, max_count)
     else:
         return _generate_words_dfs(automaton, max_length, False, max_count)
 
 
-def _generate_random_rejected_words(
+def _generate_random_words(
     automaton: Automaton, 
     max_length: int = MAX_WORD_LENGTH,
+    should_accept: bool = True,
     max_count: int = 10
 ) -> List[str]:
+    # Uniform over the words of length 1..max_length on the requested side:
+    # draw a length in proportion to its number of words, then a word of that
+    # length from the path-count table (no rejection sampling)
+    counts = cached_path_counts(automaton)
+    totals = [counts.total(length, should_accept) for length in range(1, max_length + 1)]
+    available = sum(totals)
+    rng = random.Random()
+
     result = []
+    seen = set()
     attempts = 0
-    
-    while len(result) < max_count and attempts < MAX_ATTEMPTS:
+    while len(result) < min(max_count, available) and attempts < MAX_ATTEMPTS:
         attempts += 1
-        
-        # Generate a random word
-        length = random.randint(1, max_length)
-        word = "".join(random.choice(automaton.alphabet.symbols) for _ in range(length))
-        
-        # Check if the automaton rejects this word
-        if not simulate(automaton, word) and word not in result:
+
+        r = rng.randrange(available)
+        length = 1
+        while r >= totals[length - 1]:
+            r -= totals[length - 1]
+            length += 1
+
+        # Duplicates only cost an attempt
+        word = counts.sample(length, rng, should_accept)
+        if word not in seen:
+            seen.add(word)
             result.append(word)
     
-    return result 
\ No newline at end of file
+    return result
@@ -3,9 +3,9 @@ Functions for loading and saving automata to/from JSON files.
 """
 import json
 import os
-from typing import Dict, List, Any, Optional, Union, TextIO
+from typing import Dict, List, Any, Optional, Union, TextIO, Iterator
 
-from .models import State, Alphabet, Transition, Automaton
+from .models import State, Alphabet, Transition, Automaton, EPSILON
 
 
 def save_automaton(automaton: Automaton, file_path: str) -> None:
@@ -46,9 +46,10 @@ def load_automaton(file_path: str) -> Automaton:
     
     # Create states
     states = []
+    finals = set(data["finals"])
     for state_name in data["states"]:
         is_initial = state_name == data["initial"]
-        is_final = state_name in data["finals"]
+        is_final = state_name in finals
         states.append(State(state_name, is_initial, is_final))
     
     # Create alphabet
@@ -64,12 +65,14 @@ def load_automaton(file_path: str) -> Automaton:
             raise ValueError(f"Invalid transition format: {t_data}")
         
         src_name, symbol, dest_name = t_data
+        if symbol == "":
+            symbol = EPSILON  # Empty symbol is accepted as epsilon
         
         if src_name not in state_lookup:
             raise ValueError(f"Unknown source state: {src_name}")
         if dest_name not in state_lookup:
             raise ValueError(f"Unknown destination state: {dest_name}")
-        if symbol not in alphabet:
+        if symbol != EPSILON and symbol not in alphabet:
             raise ValueError(f"Symbol not in alphabet: {symbol}")
         
         transitions.append(Transition(
@@ -108,9 +111,10 @@ def dict_to_automaton(data: Dict[str, Any]) -> Automaton:
     
     # Create states
     states = []
+    finals = set(data["finals"])
     for state_name in data["states"]:
         is_initial = state_name == data["initial"]
-        is_final = state_name in data["finals"]
+        is_final = state_name in finals
         states.append(State(state_name, is_initial, is_final))
     
     # Create alphabet
@@ -126,12 +130,14 @@ def dict_to_automaton(data: Dict[str, Any]) -> Automaton:
             raise ValueError(f"Invalid transition format: {t_data}")
         
         src_name, symbol, dest_name = t_data
+        if symbol == "":
+            symbol = EPSILON  # Empty symbol is accepted as epsilon
         
         if src_name not in state_lookup:
             raise ValueError(f"Unknown source state: {src_name}")
         if dest_name not in state_lookup:
             raise ValueError(f"Unknown destination state: {dest_name}")
-        if symbol not in alphabet:
+        if symbol != EPSILON and symbol not in alphabet:
             raise ValueError(f"Symbol not in alphabet: {symbol}")
         
         transitions.append(Transition(
@@ -141,4 +147,15 @@ def dict_to_automaton(data: Dict[str, Any]) -> Automaton:
         ))
     
     # Create automaton
-    return Automaton(data["name"], alphabet, states, transitions, creator_id) 
\ No newline at end of file
+    return Automaton(data["name"], alphabet, states, transitions, creator_id) 
+
+
+def read_text_chunks(file_path: str, chunk_size: int, encoding: str = "utf-8") -> Iterator[str]:
+    # Decoded text in chunks of chunk_size characters; newlines are kept
+    # as they are in the file so offsets match the file's characters
+    with open(file_path, 'r', encoding=encoding, newline='') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
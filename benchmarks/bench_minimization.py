@@ -0,0 +1,74 @@
+"""
+Minimization strategies compared across input shapes.
+
+Times subset construction followed by Hopcroft against Brzozowski's double
+reversal, and reports which one the "auto" selector picks.
+
+Run from the repository root:
+    python -m benchmarks.bench_minimization
+"""
+import random
+import time
+from typing import Callable, List, Tuple
+
+from automata.models import State, Alphabet, Transition, Automaton
+from automata.operations import minimize_automaton, _choose_minimization_method
+from automata.regex import compile_regex
+
+STRATEGIES = ["hopcroft", "brzozowski"]
+# "auto" is timed too, so the cost of its probe shows
+METHODS = STRATEGIES + ["auto"]
+
+
+def random_automaton(n: int, k: int, density: float, deterministic: bool, seed: int = 0) -> Automaton:
+    rng = random.Random(seed)
+    symbols = [chr(ord("a") + i) for i in range(k)]
+    states = [State(f"s{i}", i == 0, rng.random() < 0.3) for i in range(n)]
+    transitions = []
+    for state in states:
+        for symbol in symbols:
+            if deterministic:
+                transitions.append(Transition(state, symbol, rng.choice(states)))
+            else:
+                transitions.extend(
+                    Transition(state, symbol, dest) for dest in states if rng.random() < density
+                )
+    kind = "dfa" if deterministic else "nfa"
+    return Automaton(f"random_{kind}_{n}", Alphabet(symbols), states, transitions)
+
+
+# (label, factory) pairs; each shape favours a different strategy. Reversing
+# a random DFA makes it highly nondeterministic, so Brzozowski is already
+# exponential on small random DFAs
+CASES: List[Tuple[str, Callable[[], Automaton]]] = [
+    ("random DFA, 30 states", lambda: random_automaton(30, 2, 0.0, True)),
+    ("random NFA, 14 states", lambda: random_automaton(14, 2, 0.15, False)),
+    ("random NFA, 40 states", lambda: random_automaton(40, 2, 0.1, False, seed=3)),
+    ("k-th symbol from the end, k=12", lambda: compile_regex("(a|b)*a" + "(a|b)" * 12)),
+    ("k-th symbol from the start, k=12", lambda: compile_regex("(a|b)" * 12 + "a(a|b)*")),
+]
+
+
+def bench_case(label: str, factory: Callable[[], Automaton]) -> None:
+    automaton = factory()
+    timings = []
+    for method in METHODS:
+        start = time.perf_counter()
+        minimize_automaton(factory(), method)
+        timings.append(time.perf_counter() - start)
+
+    choice = _choose_minimization_method(automaton)
+    fastest = min(STRATEGIES, key=lambda m: timings[METHODS.index(m)])
+    cells = "  ".join(f"{t * 1000:9.1f} ms" for t in timings)
+    print(f"{label:<36} {len(automaton.states):>6} {cells}   auto: {choice:<10} fastest: {fastest}")
+
+
+def main() -> None:
+    header = "  ".join(f"{m:>12}" for m in METHODS)
+    print(f"{'input':<36} {'states':>6} {header}")
+    for label, factory in CASES:
+        bench_case(label, factory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Throughput of the multi-pattern Scanner over synthetic log text.
+
+Run from the repository root:
+    python -m benchmarks.bench_scanner
+"""
+import os
+import random
+import tempfile
+import time
+
+from automata.regex import compile_regex
+from automata.scanner import Scanner
+
+PATTERNS = {
+    "error": "ERROR",
+    "warning": "WARN(ING)?",
+    "latency": "[0-9]+ms",
+    "user": "user=[a-z]+",
+    "status": "status=[45][0-9][0-9]",
+}
+LEVELS = ["INFO", "DEBUG", "WARN", "WARNING", "ERROR"]
+USERS = ["alice", "bob", "carol", "dave"]
+
+
+def make_log(lines: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return "".join(
+        f"2025-05-18 12:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d} "
+        f"{rng.choice(LEVELS)} user={rng.choice(USERS)} "
+        f"status={rng.choice([200, 201, 404, 500, 503])} took {rng.randint(1, 999)}ms\n"
+        for _ in range(lines)
+    )
+
+
+def bench_scan_text(text: str) -> None:
+    scanner = Scanner({name: compile_regex(p) for name, p in PATTERNS.items()})
+    start = time.perf_counter()
+    count = sum(1 for _ in scanner.scan_iter([text]))
+    elapsed = time.perf_counter() - start
+    print(f"scan text:  {len(text) / elapsed / 1e6:6.2f} Mchar/s, "
+          f"{count / elapsed:10.0f} matches/s ({count} matches, {scanner.stats['states']} cached states)")
+
+
+def bench_scan_file(text: str, chunk_size: int = 1 << 16) -> None:
+    scanner = Scanner({name: compile_regex(p) for name, p in PATTERNS.items()})
+    with tempfile.NamedTemporaryFile('w', suffix=".log", delete=False, encoding='utf-8') as f:
+        f.write(text)
+        path = f.name
+    try:
+        start = time.perf_counter()
+        count = sum(1 for _ in scanner.scan_file(path, chunk_size))
+        elapsed = time.perf_counter() - start
+    finally:
+        os.remove(path)
+    print(f"scan file:  {len(text) / elapsed / 1e6:6.2f} Mchar/s, "
+          f"{count / elapsed:10.0f} matches/s (chunk size {chunk_size})")
+
+
+def main() -> None:
+    text = make_log(20000)
+    print(f"{len(text) / 1e6:.1f} Mchar of log text, {len(PATTERNS)} patterns")
+    bench_scan_text(text)
+    bench_scan_file(text)
+
+
+if __name__ == "__main__":
+    main()
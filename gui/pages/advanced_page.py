@@ -1,6 +1,7 @@
 
 import os
 import glob
+from itertools import islice
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
     QLabel, QPushButton, QLineEdit, QTextEdit, 
@@ -14,6 +15,7 @@ from automata.simulation import (
 from automata.operations import (
     union, intersection, complement, are_equivalent
 )
+from automata.language import iter_words
 from automata.storage import load_automaton, save_automaton
 
 from .base_page import BasePage
@@ -217,6 +219,37 @@ class AdvancedPage(BasePage):
         generate_rejected_button.clicked.connect(lambda: self.generate_words(False))
         generation_layout.addWidget(generate_rejected_button)
         
+        # Start index for paging through accepted words in shortlex order
+        start_widget = QWidget()
+        start_layout = QHBoxLayout(start_widget)
+        start_layout.setContentsMargins(0, 0, 0, 0)
+        
+        start_label = QLabel("Start Index:")
+        start_layout.addWidget(start_label)
+        
+        self.start_index_edit = QLineEdit("0")
+        self.start_index_edit.setMaximumWidth(80)
+        start_layout.addWidget(self.start_index_edit)
+        
+        start_layout.addStretch()
+        
+        generation_layout.addWidget(start_widget)
+        
+        # Paging buttons (page size is the max count)
+        paging_widget = QWidget()
+        paging_layout = QHBoxLayout(paging_widget)
+        paging_layout.setContentsMargins(0, 0, 0, 0)
+        
+        list_words_button = QPushButton("List Accepted Words")
+        list_words_button.clicked.connect(lambda: self.list_words(False))
+        paging_layout.addWidget(list_words_button)
+        
+        next_page_button = QPushButton("Next Page")
+        next_page_button.clicked.connect(lambda: self.list_words(True))
+        paging_layout.addWidget(next_page_button)
+        
+        generation_layout.addWidget(paging_widget)
+        
         # Add stretch to push widgets to the top
         left_layout.addStretch()
         
@@ -670,6 +703,51 @@ class AdvancedPage(BasePage):
         except Exception as e:
             self.sim_results_text.setText(f"Error: {str(e)}")
     
+    def list_words(self, next_page=False):
+        if not self.primary_automaton:
+            show_error(self, "Error", "No automaton loaded for simulation.")
+            return
+        
+        try:
+            try:
+                start = int(self.start_index_edit.text().strip())
+                if start < 0:
+                    raise ValueError("Start index must not be negative")
+            except ValueError:
+                show_error(self, "Invalid Input", "Start index must be a non-negative integer.")
+                return
+            
+            try:
+                page_size = int(self.max_count_edit.text().strip())
+                if page_size <= 0:
+                    raise ValueError("Max count must be positive")
+            except ValueError:
+                show_error(self, "Invalid Input", "Max count must be a positive integer.")
+                return
+            
+            if next_page:
+                start += page_size
+                self.start_index_edit.setText(str(start))
+            
+            # Words are produced lazily from their index, nothing before start is listed
+            words = list(islice(iter_words(self.primary_automaton, start=start), page_size))
+            
+            # Update results text
+            self.sim_results_text.clear()
+            self.sim_results_text.append(f"Accepted Words in shortlex order (from index {start}):")
+            
+            if not words:
+                self.sim_results_text.append("\nNo more words.")
+            else:
+                for index, word in enumerate(words, start):
+                    self.sim_results_text.append(f"{index}: '{word}'")
+            
+            # Include automaton info
+            self.sim_results_text.append(f"\nAutomaton: {self.primary_automaton.name}")
+        
+        except Exception as e:
+            self.sim_results_text.setText(f"Error: {str(e)}")
+    
     def perform_union(self):
         if not self.primary_automaton or not self.secondary_automaton:
             show_error(self, "Error", "Both primary and secondary automata must be loaded.")
@@ -271,6 +271,8 @@ class AutomataPage(BasePage):
         """
         if self.automaton is not None:
             self.automaton_modified = True
+            # Drop cached DFA/compiled forms of the edited automaton
+            self.automaton.mark_modified()
     
     def notify_automaton_changed(self):
         """
@@ -334,7 +336,11 @@ class AutomataPage(BasePage):
         alphabet_symbols = [s.strip() for s in alphabet_str.split(",")]
         
         # Create automaton with initial state
-        alphabet = Alphabet(alphabet_symbols)
+        try:
+            alphabet = Alphabet(alphabet_symbols)
+        except ValueError as e:
+            show_error(self, "Invalid Alphabet", str(e))
+            return
         initial_state = State("q0", True, False)
         states = [initial_state]
         transitions = []
@@ -505,11 +511,17 @@ class AutomataPage(BasePage):
         
         # Parse the alphabet
         new_symbols = [s.strip() for s in alphabet_str.split(",")]
+        try:
+            new_alphabet = Alphabet(new_symbols)
+        except ValueError as e:
+            show_error(self, "Invalid Alphabet", str(e))
+            return
         
         # Check if all symbols in transitions are in the new alphabet
         all_symbols_used = set()
         for transition in self.automaton.transitions:
-            all_symbols_used.add(transition.symbol)
+            if not transition.is_epsilon:
+                all_symbols_used.add(transition.symbol)
         
         symbols_not_in_new = all_symbols_used - set(new_symbols)
         
@@ -524,13 +536,15 @@ class AutomataPage(BasePage):
                 return
         
         # Update the alphabet
-        self.automaton.alphabet = Alphabet(new_symbols)
+        self.automaton.alphabet = new_alphabet
         
         # Remove transitions with symbols not in the new alphabet
-        self.automaton.transitions = [
+        removed = [
             t for t in self.automaton.transitions 
-            if t.symbol in new_symbols
+            if t.symbol not in new_symbols and not t.is_epsilon
         ]
+        for t in removed:
+            self.automaton.remove_transition(t)
         
         # Update UI
         self.update_ui()
@@ -563,14 +577,13 @@ class AutomataPage(BasePage):
                 result["is_final"]
             )
             
-            # If this is an initial state, update other states
-            if state.is_initial:
-                for other_state in self.automaton.states.values():
-                    other_state.is_initial = False
-            
             # Add the state to the automaton
             self.automaton.add_state(state)
             
+            # If this is an initial state, update other states
+            if state.is_initial:
+                self.automaton.set_initial(state.name)
+            
             # Update UI
             self.update_ui()
             
@@ -613,25 +626,11 @@ class AutomataPage(BasePage):
                 show_error(self, "Error", f"State '{result['name']}' already exists.")
                 return
             
-            # Handle initial state changes
-            was_initial = state.is_initial
-            will_be_initial = result["is_initial"]
-            
-            if will_be_initial and not was_initial:
-                # This state is becoming initial, update other states
-                for other_state in self.automaton.states.values():
-                    other_state.is_initial = False
-            
-            # Update the state
-            old_name = state.name
-            state.name = result["name"]
-            state.is_initial = will_be_initial
-            state.is_final = result["is_final"]
-            
-            # If the name changed, update the states dictionary
-            if old_name != state.name:
-                del self.automaton.states[old_name]
-                self.automaton.states[state.name] = state
+            # Update the state through the automaton so its indexes follow
+            # (a state becoming initial clears the flag on the other states)
+            self.automaton.rename_state(state.name, result["name"])
+            self.automaton.set_initial(state.name, result["is_initial"])
+            self.automaton.set_final(state.name, result["is_final"])
             
             # Update UI
             self.update_ui()
@@ -675,14 +674,8 @@ class AutomataPage(BasePage):
         if not confirm:
             return
         
-        # Remove transitions involving this state
-        self.automaton.transitions = [
-            t for t in self.automaton.transitions
-            if t.src != state and t.dest != state
-        ]
-        
-        # Remove the state
-        del self.automaton.states[state.name]
+        # Remove the state and all transitions involving it
+        self.automaton.remove_state(state.name)
         
         # Update UI
         self.update_ui()
@@ -803,7 +796,7 @@ class AutomataPage(BasePage):
                     return
             
             # Replace the transition
-            self.automaton.transitions[index] = new_transition
+            self.automaton.replace_transition(transition, new_transition)
             
             # Update UI
             self.update_ui()
@@ -846,7 +839,7 @@ class AutomataPage(BasePage):
             return
         
         # Remove the transition
-        del self.automaton.transitions[index]
+        self.automaton.remove_transition(transition)
         
         # Update UI
         self.update_ui()
@@ -5,6 +5,8 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 
+from automata.models import EPSILON
+
 
 class Form(QDialog):
     def __init__(self, parent, title):
@@ -106,6 +108,7 @@ class TransitionForm(Form):
         self.symbol_combo = QComboBox()
         for symbol in self.alphabet:
             self.symbol_combo.addItem(symbol)
+        self.symbol_combo.addItem(EPSILON)  # Epsilon transitions are always allowed
         
         if self.transition and self.transition.symbol:
             index = self.symbol_combo.findText(self.transition.symbol)
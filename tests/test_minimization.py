@@ -0,0 +1,95 @@
+"""
+Differential tests for the minimization methods: Hopcroft is checked against
+the reference Moore refinement, and the partial methods (Valmari,
+Brzozowski) against Hopcroft.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+import random
+import unittest
+from typing import List
+
+from automata.models import State, Alphabet, Transition, Automaton
+from automata.operations import minimize_automaton, are_equivalent
+
+SYMBOLS = ["a", "b"]
+
+
+def random_automaton(
+    n: int,
+    seed: int,
+    deterministic: bool = True,
+    density: float = 0.2,
+    symbols: List[str] = SYMBOLS,
+    coverage: float = 0.9
+) -> Automaton:
+    # DFAs may be partial (coverage is the share of (state, symbol) pairs
+    # with a transition), so the sink handling of each method is exercised
+    rng = random.Random(seed)
+    states = [State(f"s{i}", i == 0, rng.random() < 0.3) for i in range(n)]
+    transitions = []
+    for state in states:
+        for symbol in symbols:
+            if deterministic:
+                if rng.random() < coverage:
+                    transitions.append(Transition(state, symbol, rng.choice(states)))
+            else:
+                transitions.extend(
+                    Transition(state, symbol, dest) for dest in states if rng.random() < density
+                )
+    return Automaton(f"random_{seed}", Alphabet(symbols), states, transitions)
+
+
+class MinimizationTest(unittest.TestCase):
+
+    def test_hopcroft_matches_moore(self):
+        for seed in range(30):
+            automaton = random_automaton(25, seed)
+            hopcroft = minimize_automaton(automaton, "hopcroft")
+            moore = minimize_automaton(automaton, "moore")
+            self.assertEqual(len(hopcroft.states), len(moore.states), f"seed {seed}")
+            self.assertTrue(are_equivalent(hopcroft, moore), f"seed {seed}")
+            self.assertTrue(are_equivalent(automaton, hopcroft), f"seed {seed}")
+
+    def test_unreachable_states_are_dropped(self):
+        automaton = random_automaton(25, 0)
+        orphan = State("orphan", False, True)
+        automaton.add_state(orphan)
+        automaton.add_transition(Transition(orphan, "a", orphan))
+        for method in ("hopcroft", "moore", "valmari"):
+            minimal = minimize_automaton(automaton, method)
+            self.assertNotIn("orphan", minimal.states, method)
+
+    def test_valmari_matches_hopcroft(self):
+        for seed in range(30):
+            automaton = random_automaton(25, seed)
+            hopcroft = minimize_automaton(automaton, "hopcroft")
+            valmari = minimize_automaton(automaton, "valmari")
+            # Only the sink state may differ
+            self.assertIn(len(hopcroft.states) - len(valmari.states), (0, 1), f"seed {seed}")
+            self.assertTrue(are_equivalent(hopcroft, valmari), f"seed {seed}")
+
+    def test_valmari_on_sparse_large_alphabet(self):
+        symbols = [f"x{i}" for i in range(40)]
+        for seed in range(10):
+            automaton = random_automaton(60, seed, symbols=symbols, coverage=0.05)
+            hopcroft = minimize_automaton(automaton, "hopcroft")
+            valmari = minimize_automaton(automaton, "valmari")
+            self.assertIn(len(hopcroft.states) - len(valmari.states), (0, 1), f"seed {seed}")
+            self.assertTrue(are_equivalent(hopcroft, valmari), f"seed {seed}")
+            self.assertTrue(are_equivalent(automaton, valmari), f"seed {seed}")
+
+    def test_brzozowski_matches_hopcroft(self):
+        for seed in range(30):
+            automaton = random_automaton(8, seed, deterministic=False)
+            hopcroft = minimize_automaton(automaton, "hopcroft")
+            valmari = minimize_automaton(automaton, "valmari")
+            brzozowski = minimize_automaton(automaton, "brzozowski")
+            self.assertEqual(len(brzozowski.states), len(valmari.states), f"seed {seed}")
+            self.assertTrue(are_equivalent(hopcroft, brzozowski), f"seed {seed}")
+            self.assertTrue(are_equivalent(automaton, brzozowski), f"seed {seed}")
+
+
+if __name__ == "__main__":
+    unittest.main()
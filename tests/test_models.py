@@ -0,0 +1,122 @@
+"""
+Tests for the incremental indexes on Automaton: after random sequences of
+edits every index must match the one of a freshly built Automaton.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+import random
+import unittest
+
+from automata.models import State, Alphabet, Transition, Automaton
+from automata.simulation import simulate
+
+SYMBOLS = ["a", "b"]
+
+
+def rebuild(automaton: Automaton) -> Automaton:
+    return Automaton(automaton.name, automaton.alphabet, list(automaton.states.values()), list(automaton.transitions))
+
+
+def by_identity(index):
+    return {name: sorted(map(id, transitions)) for name, transitions in index.items() if transitions}
+
+
+def flagged(automaton: Automaton):
+    # State names in the initial/final indexes and the finality bitmask
+    finals = {name for name in automaton.states if automaton.final_mask >> automaton.state_id(name) & 1}
+    return set(automaton._initials), set(automaton._finals), finals
+
+
+class IndexMaintenanceTest(unittest.TestCase):
+
+    def assert_indexes_match(self, automaton: Automaton, step: int) -> None:
+        fresh = rebuild(automaton)
+        message = f"step {step}"
+        self.assertEqual(automaton.delta, fresh.delta, message)
+        self.assertEqual(automaton.reverse_delta, fresh.reverse_delta, message)
+        self.assertEqual(by_identity(automaton._outgoing), by_identity(fresh._outgoing), message)
+        self.assertEqual(by_identity(automaton._incoming), by_identity(fresh._incoming), message)
+        self.assertEqual(list(map(id, automaton.transitions)), list(map(id, fresh.transitions)), message)
+        self.assertEqual(flagged(automaton), flagged(fresh), message)
+        for t in automaton.transitions:
+            self.assertIn(t.src.name, automaton.states, message)
+            self.assertIn(t.dest.name, automaton.states, message)
+
+    def random_edit(self, automaton: Automaton, rng: random.Random, step: int) -> None:
+        names = list(automaton.states)
+        transitions = automaton.transitions
+        op = rng.random()
+        if op < 0.35:
+            # Transitions may hold their own State objects, equal by name
+            src, dest = rng.choice(names), rng.choice(names)
+            if rng.random() < 0.5:
+                automaton.add_transition(Transition(State(src), rng.choice(SYMBOLS), State(dest)))
+            else:
+                automaton.add_transition(Transition(automaton.states[src], rng.choice(SYMBOLS), automaton.states[dest]))
+        elif op < 0.5 and transitions:
+            t = rng.choice(transitions)
+            # Either the stored object or an equal copy
+            automaton.remove_transition(t if rng.random() < 0.5 else Transition(t.src, t.symbol, t.dest))
+        elif op < 0.6 and transitions:
+            t = rng.choice(transitions)
+            automaton.replace_transition(t, Transition(t.src, rng.choice(SYMBOLS), automaton.states[rng.choice(names)]))
+        elif op < 0.68 and len(names) > 2:
+            automaton.remove_state(rng.choice(names))
+        elif op < 0.76:
+            automaton.add_state(State(f"n{step}", False, rng.random() < 0.5))
+        elif op < 0.86:
+            automaton.rename_state(rng.choice(names), f"r{step}")
+        elif op < 0.9:
+            automaton.set_final(rng.choice(names), rng.random() < 0.5)
+        elif op < 0.94:
+            automaton.set_initial(rng.choice(names), rng.random() < 0.8)
+        else:
+            # Flags written directly on the State
+            state = automaton.states[rng.choice(names)]
+            if rng.random() < 0.5:
+                state.is_final = not state.is_final
+            else:
+                state.is_initial = not state.is_initial
+
+    def test_random_edits_keep_indexes_in_sync(self):
+        for seed in range(5):
+            rng = random.Random(seed)
+            states = [State(f"q{i}", i == 0, i % 3 == 0) for i in range(6)]
+            automaton = Automaton("edited", Alphabet(SYMBOLS), states, [])
+            for step in range(400):
+                self.random_edit(automaton, rng, step)
+                self.assert_indexes_match(automaton, step)
+
+    def test_rename_with_distinct_state_objects(self):
+        s0, s1 = State("s0", True), State("s1", False, True)
+        automaton = Automaton("renamed", Alphabet(["a"]), [s0, s1], [Transition(State("s0"), "a", State("s1"))])
+        automaton.rename_state("s1", "t1")
+        self.assertEqual(automaton.delta, {("s0", "a"): {"t1"}})
+        self.assertTrue(simulate(automaton, "a"))
+
+
+class StateFlagTest(unittest.TestCase):
+
+    def test_direct_flag_writes_update_the_automaton(self):
+        p = State("p", True)
+        automaton = Automaton("flags", Alphabet(["a"]), [p], [Transition(p, "a", p)])
+        self.assertFalse(simulate(automaton, ""))
+        automaton.states["p"].is_final = True
+        self.assertTrue(simulate(automaton, ""))
+        self.assertTrue(automaton.is_final("p"))
+        automaton.states["p"].is_final = False
+        self.assertFalse(simulate(automaton, "a"))
+
+    def test_removed_state_no_longer_reports(self):
+        p, q = State("p", True), State("q")
+        automaton = Automaton("flags", Alphabet(["a"]), [p, q], [])
+        automaton.remove_state("q")
+        version = automaton.version
+        q.is_final = True
+        self.assertEqual(automaton.version, version)
+        self.assertEqual(automaton.get_finals(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
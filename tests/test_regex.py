@@ -0,0 +1,87 @@
+"""
+Tests for the regular expression compiler: both constructions are checked
+against ``re.fullmatch`` on random patterns and words.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+import itertools
+import random
+import re
+import unittest
+
+from automata.models import EPSILON
+from automata.regex import compile_regex
+from automata.simulation import simulate
+
+ALPHABET = ["a", "b", "c"]
+METHODS = ["glushkov", "derivatives"]
+
+
+def random_pattern(rng: random.Random, depth: int = 3) -> str:
+    # Patterns in the syntax shared with Python's re module
+    if depth == 0 or rng.random() < 0.3:
+        return rng.choice(ALPHABET + [".", "[ab]", "[^a]", "[a-b]"])
+    kind = rng.choice(["cat", "alt", "repeat", "group"])
+    if kind == "cat":
+        return random_pattern(rng, depth - 1) + random_pattern(rng, depth - 1)
+    if kind == "alt":
+        return f"{random_pattern(rng, depth - 1)}|{random_pattern(rng, depth - 1)}"
+    if kind == "repeat":
+        return f"({random_pattern(rng, depth - 1)}){rng.choice('*+?')}"
+    return f"({random_pattern(rng, depth - 1)})"
+
+
+def words(max_length: int):
+    for length in range(max_length + 1):
+        for word in itertools.product(ALPHABET, repeat=length):
+            yield "".join(word)
+
+
+class RegexTest(unittest.TestCase):
+
+    def assert_matches_re(self, pattern: str, expected: str = None) -> None:
+        expected = re.compile(expected if expected is not None else pattern)
+        for method in METHODS:
+            automaton = compile_regex(pattern, ALPHABET, method)
+            for word in words(5):
+                self.assertEqual(
+                    simulate(automaton, word), bool(expected.fullmatch(word)),
+                    f"{pattern!r} ({method}) on {word!r}"
+                )
+
+    def test_random_patterns_match_re(self):
+        rng = random.Random(0)
+        for _ in range(60):
+            self.assert_matches_re(random_pattern(rng))
+
+    def test_empty_word(self):
+        self.assert_matches_re(f"a({EPSILON}|b)c", "a(|b)c")
+        self.assert_matches_re(f"{EPSILON}", "")
+        self.assert_matches_re("(a|)b")
+
+    def test_nested_plus(self):
+        self.assert_matches_re("((a+)+b)+")
+        self.assert_matches_re("((a|bc+)+)?")
+        # One state per symbol occurrence plus the initial state
+        automaton = compile_regex("((((((((a+)+)+)+)+)+)+)+)+b", ALPHABET)
+        self.assertEqual(len(automaton.states), 3)
+
+    def test_epsilon_is_never_a_symbol(self):
+        for method in METHODS:
+            automaton = compile_regex("x[α-ω]y", method=method)
+            self.assertNotIn(EPSILON, automaton.alphabet)
+            self.assertFalse(simulate(automaton, "xy"))
+            self.assertTrue(simulate(automaton, "xβy"))
+        for pattern in (f"\\{EPSILON}", f"[{EPSILON}]", f"[\\{EPSILON}a]"):
+            with self.assertRaises(ValueError):
+                compile_regex(pattern)
+
+    def test_errors(self):
+        for pattern in ("(a", "a)", "*a", "[ab", "a\\", "[a-\\", "[b-a]"):
+            with self.assertRaises(ValueError):
+                compile_regex(pattern, ALPHABET)
+
+
+if __name__ == "__main__":
+    unittest.main()